@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
+from app.core import database
+from app.core.config import settings
+from app.core.metrics import activity_events_total, activity_flush_size
+from app.models.activity import TeamActivity
+
+logger = logging.getLogger("bms.activity")
+
+# Ошибки соединения и пула: данные пачки ни при чём, её нужно просто повторить позже
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, OSError, asyncio.TimeoutError)
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _comparable(value: Any) -> Any:
+    # Статус приходит enum'ом схемы, а из БД — enum'ом модели
+    return value.value if isinstance(value, Enum) else value
+
+
+def activity_changes(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, List[Any]]:
+    return {
+        field: [_json_value(before.get(field)), _json_value(value)]
+        for field, value in after.items()
+        if _comparable(before.get(field)) != _comparable(value)
+    }
+
+
+class ActivityWriter:
+    # События копятся в памяти и вставляются одной многострочной командой раз в flush_interval
+    # или по заполнении пачки. В ленте они появляются с этой задержкой; при аварийном
+    # завершении воркера неотправленная пачка теряется.
+    def __init__(self, batch_size: int, flush_interval: float, max_buffer: int, max_retries: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_retries = max_retries
+        self._failures = 0
+        self._buffer: List[dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(
+            self,
+            team_id: int,
+            actor_id: Optional[int],
+            action: str,
+            entity_id: Optional[int] = None,
+            data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if len(self._buffer) >= self.max_buffer:
+            activity_events_total.inc("dropped")
+            return
+
+        self._buffer.append({
+            "team_id": team_id,
+            "actor_id": actor_id,
+            "action": action,
+            "entity_id": entity_id,
+            "data": {key: _json_value(value) for key, value in data.items()} if data else None,
+            "created_at": datetime.now(timezone.utc),
+        })
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:len(batch)]
+            if self._failures >= self.max_retries:
+                if not await self._flush_rows(batch):
+                    return
+                continue
+
+            try:
+                await self._insert(batch)
+            except asyncio.CancelledError:
+                self._buffer[:0] = batch
+                raise
+            except TRANSIENT_ERRORS:
+                logger.warning("Activity flush failed, retrying later", exc_info=True)
+                self._buffer[:0] = batch
+                return
+            except Exception:
+                # Пачку возвращаем целиком: новые события ограничены max_buffer в record,
+                # а после max_retries неудач подряд пачка пойдёт поштучно
+                self._failures += 1
+                logger.exception(
+                    "Activity batch of %d events failed (%d/%d)", len(batch), self._failures, self.max_retries
+                )
+                self._buffer[:0] = batch
+                return
+            self._failures = 0
+            activity_events_total.inc("written", amount=len(batch))
+            activity_flush_size.observe(len(batch))
+
+    async def _flush_rows(self, batch: List[dict]) -> bool:
+        # Пачка раз за разом отвергается из-за какого-то события: вставляем по одному и отбрасываем плохие,
+        # чтобы одно событие не останавливало ленту
+        for index, row in enumerate(batch):
+            try:
+                await self._insert([row])
+            except asyncio.CancelledError:
+                self._buffer[:0] = batch[index:]
+                raise
+            except TRANSIENT_ERRORS:
+                logger.warning("Activity flush failed, retrying later", exc_info=True)
+                self._buffer[:0] = batch[index:]
+                return False
+            except Exception:
+                logger.exception(
+                    "Dropping activity event %s for team %s", row.get("action"), row.get("team_id")
+                )
+                activity_events_total.inc("dropped")
+            else:
+                activity_events_total.inc("written")
+        self._failures = 0
+        return True
+
+    @staticmethod
+    async def _insert(rows: List[dict]) -> None:
+        async with database.async_session_maker() as session:
+            await session.execute(insert(TeamActivity), rows)
+            await session.commit()
+
+
+activity_log = ActivityWriter(
+    settings.ACTIVITY_BATCH_SIZE,
+    settings.ACTIVITY_FLUSH_INTERVAL,
+    settings.ACTIVITY_MAX_BUFFER,
+    settings.ACTIVITY_MAX_RETRIES,
+)
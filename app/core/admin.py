@@ -1,8 +1,14 @@
+import hashlib
+import hmac
+import logging
+import secrets
+
 from sqladmin import Admin
 from sqladmin.authentication import AuthenticationBackend
 from starlette.requests import Request
 
-from app.core.database import sync_engine
+from app.core.config import settings
+from app.core.database import admin_session_maker
 from app.core.admin_models import (
     UserAdmin,
     TeamAdmin,
@@ -12,36 +18,68 @@ from app.core.admin_models import (
     MeetingAdmin,
     MeetingParticipantAdmin,
     EvaluationAdmin,
+    BulkOperationsView,
 )
 
+logger = logging.getLogger("bms.admin")
+
+# Пароли из значений по умолчанию и .env.example: с ними вход в админку закрыт
+DEFAULT_ADMIN_PASSWORDS = {"", "1234", "adminpassword"}
+
+
+def admin_password_is_default() -> bool:
+    return settings.ADMIN_PASSWORD in DEFAULT_ADMIN_PASSWORDS
+
+
+def _sign(nonce: str) -> str:
+    # Пароль входит в ключ: после его смены старые сессии перестают действовать
+    key = f"{settings.SECRET_KEY}:{settings.ADMIN_PASSWORD}".encode()
+    return hmac.new(key, nonce.encode(), hashlib.sha256).hexdigest()
+
+
+def _equals(value, expected: str) -> bool:
+    return isinstance(value, str) and hmac.compare_digest(value.encode(), expected.encode())
+
+
 class AdminAuth(AuthenticationBackend):
     async def login(self, request: Request) -> bool:
+        if admin_password_is_default():
+            return False
+
         form = await request.form()
-        username = form.get("username")
-        password = form.get("password")
+        username_ok = _equals(form.get("username"), settings.ADMIN_USERNAME)
+        password_ok = _equals(form.get("password"), settings.ADMIN_PASSWORD)
+        if not (username_ok and password_ok):
+            return False
 
-        if username == "admin" and password == "1234":
-            request.session.update({"token": "admin-token"})
-            return True
-        return False
+        nonce = secrets.token_urlsafe(32)
+        request.session.update({"nonce": nonce, "token": _sign(nonce)})
+        return True
 
     async def logout(self, request: Request) -> bool:
         request.session.clear()
         return True
 
     async def authenticate(self, request: Request) -> bool:
+        if admin_password_is_default():
+            return False
+        nonce = request.session.get("nonce")
         token = request.session.get("token")
-        if token == "admin-token":
-            return True
-        return False
+        return isinstance(nonce, str) and _equals(token, _sign(nonce))
 
 
 def setup_admin(app):
+    if admin_password_is_default():
+        # Через админку доступны массовые UPDATE/DELETE, включая удаление команд
+        logger.warning("ADMIN_PASSWORD is not set or left at the default, admin login is disabled")
+
     admin = Admin(
         app,
-        sync_engine,
+        session_maker=admin_session_maker,
         base_url="/admin",
-        title="BMS Admin"
+        templates_dir="app/templates",
+        title="BMS Admin",
+        authentication_backend=AdminAuth(secret_key=settings.SECRET_KEY),
     )
 
     admin.add_view(UserAdmin)
@@ -52,5 +90,6 @@ def setup_admin(app):
     admin.add_view(MeetingAdmin)
     admin.add_view(MeetingParticipantAdmin)
     admin.add_view(EvaluationAdmin)
+    admin.add_view(BulkOperationsView)
 
     return admin
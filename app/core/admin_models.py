@@ -1,13 +1,84 @@
-from sqladmin import ModelView
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
+from sqladmin import BaseView, ModelView, action, expose
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.exc import IntegrityError
+from starlette.requests import Request
+from starlette.responses import RedirectResponse
+
+from app.core import database
+from app.core.invalidation import publish_change, commit_changes, FLUSH_EVENT
 from app.models.evaluation import Evaluation
 from app.models.meeting import Meeting, MeetingParticipant
-from app.models.task import Task, TaskComment
+from app.models.task import Task, TaskComment, TaskStatus
 from app.models.team import Team, UserTeam
 from app.models.user import User
+from app.utils.bulk import delete_by_ids, delete_where, update_by_ids, update_where
+from app.utils.teams import start_team_deletion, schedule_team_deletion
+
+
+APPROXIMATE_COUNT_QUERY = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+class BaseModelView(ModelView):
+    # Новые записи первыми; сортировка по первичному ключу всегда идёт по индексу
+    column_default_sort = ("id", True)
+    # Для больших таблиц точный COUNT(*) дороже самой страницы, берём оценку планировщика
+    approximate_count = False
+    approximate_count_threshold = 10000
+
+    async def count(self, request: Request, stmt: Optional[Select] = None) -> int:
+        if stmt is None and self.approximate_count:
+            rows = await self._run_arbitrary_query(
+                APPROXIMATE_COUNT_QUERY.bindparams(table=self.model.__tablename__)
+            )
+            estimate = rows[0][0] if rows and rows[0][0] is not None else -1
+            if estimate >= self.approximate_count_threshold:
+                return estimate
+        return await super().count(request, stmt)
+
+    async def after_model_change(self, data, model, is_created, request):
+        async with database.async_session_maker() as session:
+            await publish_change(session, FLUSH_EVENT)
+            await commit_changes(session)
+
+    async def after_model_delete(self, model, request):
+        async with database.async_session_maker() as session:
+            await publish_change(session, FLUSH_EVENT)
+            await commit_changes(session)
+
+    @staticmethod
+    def selected_ids(request: Request) -> List[int]:
+        return [int(pk) for pk in request.query_params.get("pks", "").split(",") if pk.strip().isdigit()]
 
+    async def bulk_result(self, request: Request, operation: str, affected: int):
+        async with database.async_session_maker() as session:
+            await publish_change(session, FLUSH_EVENT)
+            await commit_changes(session)
+        return await self.templates.TemplateResponse(request, "admin/bulk.html", {
+            "title": "Массовые операции",
+            "result": {"operation": operation, "affected": affected},
+            "back_url": request.url_for("admin:list", identity=self.identity),
+            "statuses": list(TaskStatus),
+        })
 
-class UserAdmin(ModelView, model=User):
+
+class BulkDeleteMixin:
+    # Зависимые строки удаляет каскад внешних ключей в БД
+    @action(
+        name="bulk-delete",
+        label="Удалить выбранные",
+        confirmation_message="Удалить выбранные записи одним запросом?",
+        add_in_detail=False,
+    )
+    async def bulk_delete(self, request: Request):
+        async with database.async_session_maker() as session:
+            affected = await delete_by_ids(session, self.model, self.selected_ids(request))
+        return await self.bulk_result(request, "Удаление", affected)
+
+
+class UserAdmin(BaseModelView, model=User):
     name = "Пользователь"
     name_plural = "Пользователи"
     icon = "fa-solid fa-user"
@@ -31,7 +102,7 @@ class UserAdmin(ModelView, model=User):
     ]
 
 
-class TeamAdmin(ModelView, model=Team):
+class TeamAdmin(BaseModelView, model=Team):
     name = "Команда"
     name_plural = "Команды"
     icon = "fa-solid fa-users"
@@ -42,7 +113,7 @@ class TeamAdmin(ModelView, model=Team):
     form_excluded_columns = [Team.members, Team.tasks, Team.meetings]
 
 
-class UserTeamAdmin(ModelView, model=UserTeam):
+class UserTeamAdmin(BaseModelView, model=UserTeam):
     name = "Участник команды"
     name_plural = "Участники команд"
     icon = "fa-solid fa-user-plus"
@@ -50,7 +121,7 @@ class UserTeamAdmin(ModelView, model=UserTeam):
     column_list = [UserTeam.id, UserTeam.user_id, UserTeam.team_id, UserTeam.role, UserTeam.created_at]
 
 
-class TaskAdmin(ModelView, model=Task):
+class TaskAdmin(BulkDeleteMixin, BaseModelView, model=Task):
     name = "Задача"
     name_plural = "Задачи"
     icon = "fa-solid fa-tasks"
@@ -67,10 +138,42 @@ class TaskAdmin(ModelView, model=Task):
     ]
 
     column_searchable_list = [Task.title]
+    column_sortable_list = [Task.id, Task.creator_id, Task.assignee_id, Task.team_id]
     form_excluded_columns = [Task.comments, Task.evaluation]
+    approximate_count = True
+
+    async def _set_status(self, request: Request, status: TaskStatus):
+        async with database.async_session_maker() as session:
+            affected = await update_by_ids(session, Task, self.selected_ids(request), {"status": status})
+        return await self.bulk_result(request, f"Смена статуса на {status.value}", affected)
 
+    @action(
+        name="complete",
+        label="Отметить выполненными",
+        confirmation_message="Отметить выбранные задачи выполненными?",
+        add_in_detail=False,
+    )
+    async def complete_tasks(self, request: Request):
+        return await self._set_status(request, TaskStatus.COMPLETED)
 
-class TaskCommentAdmin(ModelView, model=TaskComment):
+    @action(
+        name="reopen",
+        label="Открыть заново",
+        confirmation_message="Вернуть выбранные задачи в статус OPEN?",
+        add_in_detail=False,
+    )
+    async def reopen_tasks(self, request: Request):
+        return await self._set_status(request, TaskStatus.OPEN)
+
+    @action(name="reassign", label="Переназначить", add_in_detail=False)
+    async def reassign_tasks(self, request: Request):
+        url = request.url_for("admin:bulk_operations").include_query_params(
+            task_ids=request.query_params.get("pks", "")
+        )
+        return RedirectResponse(url, status_code=302)
+
+
+class TaskCommentAdmin(BulkDeleteMixin, BaseModelView, model=TaskComment):
     name = "Комментарий"
     name_plural = "Комментарии"
     icon = "fa-solid fa-comment"
@@ -84,9 +187,11 @@ class TaskCommentAdmin(ModelView, model=TaskComment):
     ]
 
     column_searchable_list = [TaskComment.content]
+    column_sortable_list = [TaskComment.id, TaskComment.task_id, TaskComment.author_id]
+    approximate_count = True
 
 
-class MeetingAdmin(ModelView, model=Meeting):
+class MeetingAdmin(BaseModelView, model=Meeting):
     name = "Встреча"
     name_plural = "Встречи"
     icon = "fa-solid fa-calendar"
@@ -105,7 +210,7 @@ class MeetingAdmin(ModelView, model=Meeting):
     form_excluded_columns = [Meeting.participants]
 
 
-class MeetingParticipantAdmin(ModelView, model=MeetingParticipant):
+class MeetingParticipantAdmin(BulkDeleteMixin, BaseModelView, model=MeetingParticipant):
     name = "Участник встречи"
     name_plural = "Участники встреч"
     icon = "fa-solid fa-user-check"
@@ -116,9 +221,11 @@ class MeetingParticipantAdmin(ModelView, model=MeetingParticipant):
         MeetingParticipant.user_id,
         MeetingParticipant.created_at
     ]
+    column_sortable_list = [MeetingParticipant.id, MeetingParticipant.meeting_id, MeetingParticipant.user_id]
+    approximate_count = True
 
 
-class EvaluationAdmin(ModelView, model=Evaluation):
+class EvaluationAdmin(BaseModelView, model=Evaluation):
     name = "Оценка"
     name_plural = "Оценки"
     icon = "fa-solid fa-star"
@@ -131,3 +238,111 @@ class EvaluationAdmin(ModelView, model=Evaluation):
         Evaluation.task_id,
         Evaluation.created_at
     ]
+
+
+def _optional_int(form, field: str) -> Optional[int]:
+    value = (form.get(field) or "").strip()
+    if not value:
+        return None
+    if not value.isdigit():
+        raise ValueError(f"Поле {field} должно быть числом")
+    return int(value)
+
+
+def _id_list(value: str) -> List[int]:
+    return [int(pk) for pk in value.split(",") if pk.strip().isdigit()]
+
+
+class BulkOperationsView(BaseView):
+    name = "Массовые операции"
+    icon = "fa-solid fa-layer-group"
+
+    @expose("/bulk", methods=["GET", "POST"], identity="bulk_operations")
+    async def bulk_operations(self, request: Request):
+        context: Dict[str, Any] = {
+            "title": "Массовые операции",
+            "task_ids": request.query_params.get("task_ids", ""),
+            "statuses": list(TaskStatus),
+        }
+
+        if request.method == "POST":
+            form = await request.form()
+            context["task_ids"] = form.get("task_ids", "")
+            try:
+                async with database.async_session_maker() as session:
+                    operation, affected = await self._run(session, form)
+                    await publish_change(session, FLUSH_EVENT)
+                    await commit_changes(session)
+                context["result"] = {"operation": operation, "affected": affected}
+            except ValueError as e:
+                context["error"] = str(e)
+            except IntegrityError:
+                # Проверка в _run не спасает от гонки: пользователя могли удалить во время операции
+                context["error"] = "Операция нарушает связи между записями, данные могли измениться"
+
+        return await self.templates.TemplateResponse(request, "admin/bulk.html", context)
+
+    async def _run(self, session, form):
+        operation = form.get("operation")
+
+        if operation == "reassign":
+            task_ids = _id_list(form.get("task_ids", ""))
+            from_user_id = _optional_int(form, "from_user_id")
+            to_user_id = _optional_int(form, "to_user_id")
+            if to_user_id is not None and await session.get(User, to_user_id) is None:
+                raise ValueError(f"Пользователь {to_user_id} не найден")
+            values = {"assignee_id": to_user_id}
+
+            if task_ids:
+                return "Переназначение выбранных задач", await update_by_ids(session, Task, task_ids, values)
+            if from_user_id is None:
+                raise ValueError("Укажите, с какого исполнителя переназначить задачи")
+            if from_user_id == to_user_id:
+                raise ValueError("Исполнители совпадают")
+
+            criteria = [Task.assignee_id == from_user_id]
+            if form.get("only_open"):
+                criteria.append(Task.status.is_distinct_from(TaskStatus.COMPLETED))
+            return "Переназначение задач исполнителя", await update_where(session, Task, criteria, values)
+
+        if operation == "close_stale":
+            deadline_before = form.get("deadline_before")
+            if not deadline_before:
+                raise ValueError("Укажите дату дедлайна")
+            try:
+                deadline = datetime.fromisoformat(deadline_before)
+            except ValueError:
+                raise ValueError("Неверный формат даты")
+
+            criteria = [Task.deadline < deadline, Task.status.is_distinct_from(TaskStatus.COMPLETED)]
+            values = {"status": TaskStatus.COMPLETED}
+            return "Закрытие просроченных задач", await update_where(session, Task, criteria, values)
+
+        if operation == "purge_participants":
+            user_id = _optional_int(form, "user_id")
+            meeting_id = _optional_int(form, "meeting_id")
+            criteria = []
+            if user_id is not None:
+                criteria.append(MeetingParticipant.user_id == user_id)
+            if meeting_id is not None:
+                criteria.append(MeetingParticipant.meeting_id == meeting_id)
+            if not criteria:
+                raise ValueError("Укажите пользователя или встречу")
+            if form.get("only_past"):
+                criteria.append(MeetingParticipant.meeting_id.in_(
+                    select(Meeting.id).where(Meeting.end_time < func.now())
+                ))
+            return "Удаление участников встреч", await delete_where(session, MeetingParticipant, criteria)
+
+        if operation == "delete_team":
+            team_id = _optional_int(form, "team_id")
+            if team_id is None:
+                raise ValueError("Укажите команду")
+            removed = await start_team_deletion(session, team_id)
+            if removed is None:
+                raise ValueError("Команда не найдена или уже удаляется")
+            await session.commit()
+            schedule_team_deletion(team_id)
+            return "Удаление команды запущено в фоне, удалено участников", removed
+
+        raise ValueError("Неизвестная операция")
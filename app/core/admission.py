@@ -0,0 +1,127 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.core.metrics import db_pool_wait_recent_seconds, load_shed_total
+
+
+class PoolPressure:
+    # Скользящее среднее ожидания соединения, которое затухает, пока новых ожиданий нет
+    def __init__(self, half_life: float, alpha: float = 0.2):
+        self.half_life = half_life
+        self.alpha = alpha
+        self._wait = 0.0
+        self._updated_at = time.monotonic()
+
+    def _decayed(self, now: float) -> float:
+        return self._wait * math.pow(0.5, (now - self._updated_at) / self.half_life)
+
+    def observe(self, wait: float) -> None:
+        now = time.monotonic()
+        self._wait = self._decayed(now) * (1 - self.alpha) + wait * self.alpha
+        self._updated_at = now
+
+    @property
+    def wait(self) -> float:
+        return self._decayed(time.monotonic())
+
+
+pool_pressure = PoolPressure(settings.LOAD_SHED_HALF_LIFE)
+
+OVERLOADED_DETAIL = "Service is overloaded, try again later"
+
+
+def _split(value: str) -> tuple:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+class LoadShedder:
+    def __init__(
+            self,
+            low_priority_prefixes: Optional[Iterable[str]] = None,
+            max_pool_wait: float = settings.LOAD_SHED_POOL_WAIT_SECONDS,
+            max_in_flight: int = settings.LOAD_SHED_MAX_IN_FLIGHT,
+            retry_after: int = settings.LOAD_SHED_RETRY_AFTER,
+    ):
+        if low_priority_prefixes is None:
+            low_priority_prefixes = _split(settings.LOAD_SHED_LOW_PRIORITY_PATHS)
+        self.low_priority_prefixes = tuple(low_priority_prefixes)
+        self.max_pool_wait = max_pool_wait
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.in_flight = 0
+
+    def low_priority_prefix(self, scope) -> Optional[str]:
+        # Авторизацию и запись не отбрасываем никогда, только тяжёлые чтения
+        if not settings.LOAD_SHED_ENABLED or scope["method"] != "GET":
+            return None
+        path = scope["path"]
+        for prefix in self.low_priority_prefixes:
+            if path.startswith(prefix):
+                return prefix
+        return None
+
+    def overloaded(self) -> Optional[str]:
+        wait = pool_pressure.wait
+        db_pool_wait_recent_seconds.set(wait)
+        if wait > self.max_pool_wait:
+            return "pool_wait"
+        if self.in_flight >= self.max_in_flight:
+            return "in_flight"
+        return None
+
+    def shed(self, prefix: str) -> bool:
+        reason = self.overloaded()
+        if reason is None:
+            return False
+        load_shed_total.inc(prefix, reason)
+        return True
+
+    @contextmanager
+    def admitted(self, prefix: Optional[str]):
+        # Считаем только защищаемые чтения: долгие SSE-подключения и прочие запросы
+        # не должны держать счётчик у порога, когда пул свободен
+        if prefix is None:
+            yield
+            return
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+# Общий для middleware и вложенных запросов /batch, иначе батч обходил бы ограничение
+load_shedder = LoadShedder()
+
+
+class LoadSheddingMiddleware:
+    def __init__(self, app, shedder: LoadShedder = load_shedder):
+        self.app = app
+        self.shedder = shedder
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        prefix = self.shedder.low_priority_prefix(scope)
+        if prefix is not None and self.shedder.shed(prefix):
+            body = json.dumps({"detail": OVERLOADED_DETAIL}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.shedder.retry_after).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        with self.shedder.admitted(prefix):
+            await self.app(scope, receive, send)
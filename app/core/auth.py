@@ -1,8 +1,16 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Depends, HTTPException
 from fastapi_users import FastAPIUsers
 from fastapi_users.authentication import AuthenticationBackend, BearerTransport, JWTStrategy
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 
+from app.core import database
 from app.core.config import settings
-from app.core.user_manager import get_user_manager
+from app.core.user_cache import token_user_cache, UserSnapshot
+from app.core.user_manager import get_user_manager, UserManager
 from app.models.user import User
 
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
@@ -23,4 +31,41 @@ fastapi_users = FastAPIUsers[User, int](
     [auth_backend],
 )
 
-current_active_user = fastapi_users.current_user(active=True)
+
+async def authenticate_token(token: Optional[str]) -> Optional[User]:
+    if not token:
+        return None
+
+    if token_user_cache.enabled:
+        cached = token_user_cache.get(token)
+        if cached is not None:
+            return cached
+
+    started_at = time.time()
+    async with database.async_session_maker() as session:
+        user_manager = UserManager(SQLAlchemyUserDatabase(session, User))
+        user = await get_jwt_strategy().read_token(token, user_manager)
+
+    if user is None or not user.is_active:
+        return None
+
+    snapshot = UserSnapshot(user)
+    if token_user_cache.enabled:
+        token_user_cache.set(token, snapshot, started_at)
+    return snapshot
+
+
+# Пользователь, уже разрешённый для /batch: вложенные запросы идут с тем же токеном
+batch_user: ContextVar[Optional[UserSnapshot]] = ContextVar("batch_user", default=None)
+
+
+# Обработчикам нужен только снимок пользователя, поэтому вместо fastapi_users.current_user
+# токен разрешается через кэш. Маршруты fastapi-users (/auth/users/me и т.п.) по-прежнему
+# получают ORM-объект из БД.
+async def current_active_user(token: Optional[str] = Depends(bearer_transport.scheme)) -> User:
+    user = batch_user.get()
+    if user is None:
+        user = await authenticate_token(token)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return user
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import math
+from typing import List, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+
+from app.core.admission import OVERLOADED_DETAIL, load_shedder
+from app.core.auth import batch_user
+from app.core.config import settings
+from app.core.metrics import batch_subrequests_total, rate_limited_total
+from app.core.rate_limit import rate_limiter
+from app.core.replica import SAFE_METHODS, credential_key, primary_stickiness
+from app.schemas.batch import BatchRequestItem, BatchResponseItem
+from app.utils.teams import clear_team_role_cache, team_role_cache
+
+ALLOWED_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+# Потоковые ответы, вложенные батчи и админка через /batch не проходят
+EXCLUDED_PREFIXES = ("/batch", "/events", "/admin", "/static")
+# Заголовки аутентификации берутся только из внешнего запроса
+INHERITED_HEADERS = frozenset({b"authorization", b"cookie", b"user-agent", b"accept-language"})
+RETURNED_HEADERS = frozenset({"content-type", "etag", "last-modified", "cache-control", "retry-after", "location"})
+
+
+def _error(status: int, detail: str) -> BatchResponseItem:
+    return BatchResponseItem(status=status, headers={"content-type": "application/json"}, body={"detail": detail})
+
+
+def _sub_scope(scope, item: BatchRequestItem, body: bytes) -> dict:
+    path, _, query = item.path.partition("?")
+    headers = [(name, value) for name, value in scope["headers"] if name in INHERITED_HEADERS]
+    for name, value in item.headers.items():
+        name = name.lower().encode("latin-1")
+        if name not in INHERITED_HEADERS and name != b"content-length":
+            headers.append((name, value.encode("latin-1")))
+    if body:
+        if not any(name == b"content-type" for name, _ in headers):
+            headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    return {
+        "type": "http",
+        "asgi": scope.get("asgi", {"version": "3.0"}),
+        "http_version": scope.get("http_version", "1.1"),
+        "method": item.method.upper(),
+        "scheme": scope["scheme"],
+        "server": scope.get("server"),
+        "client": scope.get("client"),
+        "root_path": scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "app": scope["app"],
+        "state": {},
+        # Обработчики исключений FastAPI ставит внешний ExceptionMiddleware, вложенным нужны те же
+        "starlette.exception_handlers": scope["starlette.exception_handlers"],
+    }
+
+
+def _decode_body(content_type: str, body: bytes):
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def _rate_limited(sub_scope) -> bool:
+    if not settings.RATE_LIMIT_ENABLED:
+        return False
+    limited = await rate_limiter.check(sub_scope)
+    if limited is None:
+        return False
+    rule, retry_after = limited
+    rate_limited_total.inc(rule.name)
+    sub_scope["retry_after"] = math.ceil(retry_after)
+    return True
+
+
+async def dispatch(scope, item: BatchRequestItem) -> BatchResponseItem:
+    method = item.method.upper()
+    if method not in ALLOWED_METHODS:
+        return _error(405, "Method not allowed in batch")
+    if not item.path.startswith("/") or item.path.startswith(EXCLUDED_PREFIXES):
+        return _error(400, "Path is not allowed in batch")
+
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+    sub_scope = _sub_scope(scope, item, body)
+    if await _rate_limited(sub_scope):
+        response = _error(429, "Too many requests")
+        response.headers["retry-after"] = str(sub_scope["retry_after"])
+        return response
+    prefix = load_shedder.low_priority_prefix(sub_scope)
+    if prefix is not None and load_shedder.shed(prefix):
+        response = _error(503, OVERLOADED_DETAIL)
+        response.headers["retry-after"] = str(load_shedder.retry_after)
+        return response
+
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 500
+    headers = []
+    chunks = []
+
+    async def send(message):
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    # Маршрутизатор вызывается напрямую: внешние middleware уже отработали для самого /batch
+    try:
+        with load_shedder.admitted(prefix):
+            await scope["app"].router(sub_scope, receive, send)
+    except HTTPException as e:
+        # Так маршрутизатор сообщает о ненайденном пути
+        status = e.status_code
+        return _error(e.status_code, e.detail)
+    except Exception as e:
+        print(f"Batch sub-request {method} {item.path} failed: {str(e)}")
+        status = 500
+        return _error(500, "Internal Server Error")
+    finally:
+        route = sub_scope.get("route")
+        batch_subrequests_total.inc(method, getattr(route, "path", None) or "<unmatched>", str(status))
+
+    response_headers = Headers(raw=headers)
+    content_type = response_headers.get("content-type", "")
+    return BatchResponseItem(
+        status=status,
+        headers={name: value for name, value in response_headers.items() if name in RETURNED_HEADERS},
+        body=_decode_body(content_type, b"".join(chunks)),
+    )
+
+
+def _waves(items: List[BatchRequestItem]) -> List[Tuple[bool, List[int]]]:
+    # Подряд идущие чтения независимы и выполняются параллельно,
+    # каждая запись — отдельным шагом, чтобы следующие запросы видели её результат
+    waves = []
+    for index, item in enumerate(items):
+        safe = item.method.upper() in SAFE_METHODS
+        if safe and waves and waves[-1][0]:
+            waves[-1][1].append(index)
+        else:
+            waves.append((safe, [index]))
+    return waves
+
+
+async def run_batch(scope, user, items: List[BatchRequestItem]) -> List[BatchResponseItem]:
+    results: List[BatchResponseItem] = [None] * len(items)
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+    async def run(index: int):
+        async with semaphore:
+            results[index] = await dispatch(scope, items[index])
+
+    user_token = batch_user.set(user)
+    try:
+        with team_role_cache():
+            for safe, indexes in _waves(items):
+                if safe:
+                    await asyncio.gather(*(run(index) for index in indexes))
+                    continue
+
+                index = indexes[0]
+                await run(index)
+                if results[index].status < 400:
+                    # Запись могла поменять роли, а последующие чтения не должны уйти на отстающую реплику
+                    clear_team_role_cache()
+                    key = credential_key(Headers(scope=scope).get("authorization"))
+                    if key is not None:
+                        primary_stickiness.mark(key)
+    finally:
+        batch_user.reset(user_token)
+    return results
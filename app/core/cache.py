@@ -0,0 +1,324 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.core.metrics import cache_requests_total
+
+
+def make_cache_key(route: str, user_id: int, **params: Any) -> str:
+    query = "&".join(f"{name}={params[name]}" for name in sorted(params))
+    return f"{route}:user={user_id}:{query}"
+
+
+class CacheBackend:
+    shared = False
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: int, started_at: float) -> None:
+        raise NotImplementedError
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        self._cleared_at = 0.0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at < time.time():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: int, started_at: float) -> None:
+        tags = tuple(tags)
+        if self._cleared_at >= started_at:
+            return
+        if any(self._invalidated_at.get(tag, 0) >= started_at for tag in tags):
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.time() + ttl, value, tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        now = time.time()
+        for tag in tags:
+            self._invalidated_at[tag] = now
+            for key in self._tag_index.pop(tag, set()):
+                self._remove(key)
+
+        if len(self._invalidated_at) > self.max_entries:
+            horizon = now - settings.CACHE_TTL
+            self._invalidated_at = {
+                tag: invalidated_at
+                for tag, invalidated_at in self._invalidated_at.items()
+                if invalidated_at >= horizon
+            }
+
+    async def clear(self) -> None:
+        self._cleared_at = time.time()
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+class RedisProtocolError(Exception):
+    pass
+
+
+class RedisConnection:
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def execute(self, *args: Any) -> Any:
+        return (await self.pipeline([args]))[0]
+
+    async def pipeline(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            try:
+                await self._ensure_connected()
+                self._writer.write(b"".join(self._encode(command) for command in commands))
+                await self._writer.drain()
+                return [await self._read_reply() for _ in commands]
+            except (OSError, asyncio.IncompleteReadError, RedisProtocolError):
+                await self._close()
+                raise
+
+    async def _ensure_connected(self) -> None:
+        if self._writer is not None and not self._writer.is_closing():
+            return
+
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        handshake = []
+        if self.password:
+            handshake.append(("AUTH", self.password))
+        if self.db:
+            handshake.append(("SELECT", self.db))
+        if handshake:
+            self._writer.write(b"".join(self._encode(command) for command in handshake))
+            await self._writer.drain()
+            for _ in handshake:
+                await self._read_reply()
+
+    async def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+    @staticmethod
+    def _encode(command: Tuple[Any, ...]) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readuntil(b"\r\n")
+        prefix, payload = line[:1], line[1:-2]
+
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RedisProtocolError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+
+        raise RedisProtocolError(f"Unexpected reply prefix: {prefix!r}")
+
+
+# Проверка отметок инвалидации и запись выполняются в Redis одной командой: между ними
+# не вклинится invalidate_tags из другого воркера.
+# KEYS: ключ ответа, отметка очистки, n отметок тегов, n множеств тегов; ARGV: значение, ttl, started_at
+SET_IF_VALID_SCRIPT = """
+local n = (#KEYS - 2) / 2
+local started_at = tonumber(ARGV[3])
+for i = 2, n + 2 do
+    local stamp = redis.call('GET', KEYS[i])
+    if stamp and tonumber(stamp) >= started_at then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = n + 3, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+return 1
+"""
+
+# Отметки ставятся и ключи удаляются атомарно, иначе запись, успевшая проверить отметку,
+# могла бы добавить ключ в множество тега уже после SMEMBERS.
+# KEYS: n отметок тегов, n множеств тегов; ARGV: время инвалидации, срок хранения отметки
+INVALIDATE_TAGS_SCRIPT = """
+local n = #KEYS / 2
+for i = 1, n do
+    redis.call('SET', KEYS[i], ARGV[1], 'EX', ARGV[2])
+end
+for i = n + 1, #KEYS do
+    local members = redis.call('SMEMBERS', KEYS[i])
+    for j = 1, #members, 1000 do
+        redis.call('DEL', unpack(members, j, math.min(j + 999, #members)))
+    end
+    redis.call('DEL', KEYS[i])
+end
+return 1
+"""
+
+
+class RedisCacheBackend(CacheBackend):
+    shared = True
+
+    def __init__(self, url: str, namespace: str = "bms"):
+        self.connection = RedisConnection(url)
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:cache:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    def _invalidated_key(self, tag: str) -> str:
+        return f"{self.namespace}:invalidated:{tag}"
+
+    def _cleared_key(self) -> str:
+        return f"{self.namespace}:cleared"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.connection.execute("GET", self._key(key))
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: int, started_at: float) -> None:
+        tags = list(tags)
+        keys = [self._key(key), self._cleared_key()]
+        keys += [self._invalidated_key(tag) for tag in tags]
+        keys += [self._tag_key(tag) for tag in tags]
+        await self.connection.execute("EVAL", SET_IF_VALID_SCRIPT, len(keys), *keys, value, ttl, repr(started_at))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        if not tags:
+            return
+
+        keys = [self._invalidated_key(tag) for tag in tags] + [self._tag_key(tag) for tag in tags]
+        await self.connection.execute(
+            "EVAL", INVALIDATE_TAGS_SCRIPT, len(keys), *keys, repr(time.time()), settings.CACHE_TTL * 2
+        )
+
+    async def clear(self) -> None:
+        # Отметка очистки ставится до удаления: ответы, начатые раньше неё, уже не попадут в кеш
+        await self.connection.execute("SET", self._cleared_key(), repr(time.time()), "EX", settings.CACHE_TTL * 2)
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.connection.execute(
+                "SCAN", cursor, "MATCH", f"{self.namespace}:cache:*", "COUNT", 1000
+            )
+            if keys:
+                await self.connection.execute("DEL", *keys)
+            if cursor == b"0":
+                break
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def clock() -> float:
+        return time.time()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            print(f"Cache get failed: {str(e)}")
+            value = None
+        cache_requests_total.inc("miss" if value is None else "hit")
+        return value
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], started_at: float) -> None:
+        try:
+            await self.backend.set(key, value, tags, self.ttl, started_at)
+        except Exception as e:
+            print(f"Cache set failed: {str(e)}")
+
+    async def invalidate(self, *tags: str) -> None:
+        try:
+            await self.backend.invalidate_tags(tags)
+        except Exception as e:
+            print(f"Cache invalidation failed: {str(e)}")
+
+    async def clear(self) -> None:
+        try:
+            await self.backend.clear()
+        except Exception as e:
+            print(f"Cache clear failed: {str(e)}")
+
+
+def create_cache_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_URL)
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(create_cache_backend(), settings.CACHE_TTL)
@@ -19,14 +19,110 @@ class Settings:
 
     DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+    # Read replica
+    REPLICA_DATABASE_URL: str = os.getenv("REPLICA_DATABASE_URL", "")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 10))
+    REPLICA_STICKINESS_SECONDS: int = int(os.getenv("REPLICA_STICKINESS_SECONDS", 5))
+
+    # Connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", 2))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+    # SQL diagnostics
+    SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() == "true"
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 0))
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+
+    # Health checks
+    HEALTH_PROBE_TIMEOUT: float = float(os.getenv("HEALTH_PROBE_TIMEOUT", 2))
+    HEALTH_CACHE_TTL: float = float(os.getenv("HEALTH_CACHE_TTL", 2))
+
     # Secret
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    AUTH_CACHE_TTL: float = float(os.getenv("AUTH_CACHE_TTL", 30))
+    AUTH_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", 10000))
+    # Пул хеширования есть в каждом процессе uvicorn: по умолчанию ядра делятся между процессами
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", 1))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS") or max((os.cpu_count() or 1) // max(WEB_CONCURRENCY, 1), 1)
+    )
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
 
     # Admin panel
     ADMIN_USERNAME: str = os.getenv("ADMIN_USERNAME", "admin")
     ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD", "adminpassword")
+    ADMIN_BULK_CHUNK_SIZE: int = int(os.getenv("ADMIN_BULK_CHUNK_SIZE", 5000))
+
+    # Background jobs
+    TEAM_DELETE_CHUNK_SIZE: int = int(os.getenv("TEAM_DELETE_CHUNK_SIZE", 1000))
+    TASK_ARCHIVE_AFTER_DAYS: int = int(os.getenv("TASK_ARCHIVE_AFTER_DAYS", 90))
+    TASK_ARCHIVE_BATCH_SIZE: int = int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", 1000))
+    TASK_ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("TASK_ARCHIVE_INTERVAL_SECONDS", 3600))
+
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_URL: str = os.getenv("RATE_LIMIT_URL", os.getenv("CACHE_URL", "redis://localhost:6379/0"))
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+    RATE_LIMIT_RULES: str = os.getenv(
+        "RATE_LIMIT_RULES",
+        "POST /auth/jwt/login=10/60:ip;"
+        "POST /auth/register=5/300:ip;"
+        "POST /teams/join=10/60:user;"
+        "POST /teams/join=30/60:ip;"
+        "GET /tasks/list=120/60:user;"
+        "GET /tasks/my-team-tasks=30/60:user;"
+        "GET /evaluations/list=60/60:user;"
+        "GET /users/=30/60:user;"
+        "GET /users/list=30/60:user;"
+        "GET /meetings/list=60/60:user;"
+        "GET /meetings/team/{team_id}=60/60:user"
+    )
+
+    # Load shedding
+    LOAD_SHED_ENABLED: bool = os.getenv("LOAD_SHED_ENABLED", "true").lower() == "true"
+    LOAD_SHED_POOL_WAIT_SECONDS: float = float(os.getenv("LOAD_SHED_POOL_WAIT_SECONDS", 0.5))
+    LOAD_SHED_MAX_IN_FLIGHT: int = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", 200))
+    LOAD_SHED_HALF_LIFE: float = float(os.getenv("LOAD_SHED_HALF_LIFE", 2))
+    LOAD_SHED_RETRY_AFTER: int = int(os.getenv("LOAD_SHED_RETRY_AFTER", 2))
+    LOAD_SHED_LOW_PRIORITY_PATHS: str = os.getenv(
+        "LOAD_SHED_LOW_PRIORITY_PATHS",
+        "/tasks/list,/tasks/my-team-tasks,/teams/list,/meetings/list,/meetings/team/,"
+        "/evaluations/list,/evaluations/user/,/users/,/calendar/events,/dashboard/summary"
+    )
+
+    # Delta sync
+    SYNC_PAGE_SIZE: int = int(os.getenv("SYNC_PAGE_SIZE", 200))
+    SYNC_SETTLE_SECONDS: float = float(os.getenv("SYNC_SETTLE_SECONDS", 5))
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+    SYNC_TOMBSTONE_PURGE_INTERVAL_SECONDS: int = int(os.getenv("SYNC_TOMBSTONE_PURGE_INTERVAL_SECONDS", 3600))
+
+    # Activity log
+    ACTIVITY_BATCH_SIZE: int = int(os.getenv("ACTIVITY_BATCH_SIZE", 500))
+    ACTIVITY_FLUSH_INTERVAL: float = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", 0.5))
+    ACTIVITY_MAX_BUFFER: int = int(os.getenv("ACTIVITY_MAX_BUFFER", 10000))
+    ACTIVITY_MAX_RETRIES: int = int(os.getenv("ACTIVITY_MAX_RETRIES", 3))
+
+    # Batch requests
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", 20))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", 4))
+
+    # Response cache
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_URL: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_TTL: int = int(os.getenv("CACHE_TTL", 60))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+
+    # JSON serialization
+    JSON_FAST_PATH: bool = os.getenv("JSON_FAST_PATH", "false").lower() == "true"
+    JSON_ENCODER: str = os.getenv("JSON_ENCODER", "pydantic")
 
 
 settings = Settings()
@@ -1,51 +1,164 @@
-from typing import AsyncGenerator
+import asyncio
+import logging
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Set
 
+from alembic.config import Config
+from alembic.script import ScriptDirectory
 from fastapi import Depends
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
-from sqlalchemy import create_engine
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from .admission import pool_pressure
 from .config import settings
+from .metrics import db_pool_wait_seconds
+from .query_stats import install_query_hooks
+
+logger = logging.getLogger("bms.db")
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started_at
+            db_pool_wait_seconds.observe(waited)
+            pool_pressure.observe(waited)
+
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def _pool_options() -> Dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+
+def _asyncpg_connect_args() -> Dict[str, Any]:
+    if settings.DB_PGBOUNCER:
+        # В transaction-режиме PgBouncer подготовленные выражения не переживают смену серверного соединения
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    # Кешей два: у asyncpg на соединении и у адаптера SQLAlchemy; DB_STATEMENT_CACHE_SIZE=0 выключает оба
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 
-sync_engine = create_engine(
-    settings.DATABASE_URL,
-    echo=True,
-)
 
 async_engine = None
 async_session_maker = None
+# sqladmin получает фабрику сессий при импорте приложения, движок привязывается в init_db
+admin_session_maker = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+replica_engine = None
+replica_session_maker = None
 
 Base = declarative_base()
 
 
+def _create_async_engine(url: str):
+    engine = create_async_engine(
+        url.replace("postgresql", "postgresql+asyncpg"),
+        echo=settings.SQL_ECHO,
+        poolclass=InstrumentedAsyncPool,
+        connect_args=_asyncpg_connect_args(),
+        **_pool_options()
+    )
+    install_query_hooks(engine.sync_engine)
+    return engine
+
+
 async def init_db():
     print('Начат init_db')
-    global async_engine, async_session_maker
-    async_engine = create_async_engine(
-        settings.DATABASE_URL.replace("postgresql", "postgresql+asyncpg"),
-        echo=True,
-        pool_pre_ping=True
-    )
+    global async_engine, async_session_maker, replica_engine, replica_session_maker
+    async_engine = _create_async_engine(settings.DATABASE_URL)
     async_session_maker = async_sessionmaker(
         bind=async_engine,
         class_=AsyncSession,
         expire_on_commit=False
     )
+    admin_session_maker.configure(bind=async_engine)
+
+    if settings.REPLICA_DATABASE_URL:
+        replica_engine = _create_async_engine(settings.REPLICA_DATABASE_URL)
+        replica_session_maker = async_sessionmaker(
+            bind=replica_engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
 
     print('End init_db')
 
 
-async def create_table() -> bool:
+async def warm_up_pool(connections: int) -> None:
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return
+
+    results = await asyncio.gather(
+        *(async_engine.connect() for _ in range(connections)),
+        return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+
+    logger.info("Пул соединений прогрет: %d из %d", len(opened), connections)
+    for error in results:
+        if isinstance(error, BaseException):
+            logger.warning("Ошибка прогрева пула: %s", error)
+            break
+
+
+async def dispose_engines() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    logger.info("Соединения с БД закрыты")
+
+
+def expected_schema_revisions() -> Set[str]:
+    config = Config(str(ALEMBIC_INI))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def check_schema_revision() -> bool:
+    # Схему меняет только `alembic upgrade head`; воркеры при старте лишь сверяют ревизию
     try:
-        async with async_engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        print("Таблицы БД успешно созданы")
-        return True
+        async with async_engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars().all())
     except Exception as e:
-        print(f"Ошибка при создании таблиц БД: {str(e)}")
+        logger.error("Не удалось прочитать ревизию схемы БД, выполните `alembic upgrade head`: %s", e)
         return False
 
+    expected = expected_schema_revisions()
+    if current != expected:
+        logger.error(
+            "Ревизия схемы БД %s не совпадает с ожидаемой %s, выполните `alembic upgrade head`",
+            sorted(current), sorted(expected),
+        )
+        return False
+
+    logger.info("Схема БД актуальна: %s", ", ".join(sorted(current)))
+    return True
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
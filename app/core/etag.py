@@ -0,0 +1,60 @@
+import hashlib
+from typing import Any
+
+from fastapi.requests import Request
+from fastapi.responses import Response
+
+CACHE_CONTROL = "private, no-cache"
+VERSION_HEADER = "X-Resource-Version"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    return etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(","))
+
+
+def version_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def if_match_satisfied(request: Request, version: int) -> bool:
+    if_match = request.headers.get("if-match")
+    if not if_match or if_match.strip() == "*":
+        return True
+    # If-Match сравнивается строго, слабый ETag из GET ему не подходит. Клиент передаёт версию
+    # из X-Resource-Version: она меняется только при правке самой записи, а не комментариев или участников
+    current = version_etag(version)
+    return any(candidate.strip() == current for candidate in if_match.split(","))
+
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified_response(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag_headers(response, etag)
+    return response
+
+
+def set_version_header(response: Response, version: int) -> None:
+    response.headers[VERSION_HEADER] = str(version)
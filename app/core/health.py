@@ -0,0 +1,118 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.metrics import db_replica_lag_seconds
+
+
+def pool_status(engine: Optional[AsyncEngine]) -> Dict[str, Any]:
+    if engine is None:
+        return {}
+
+    pool = engine.pool
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+class DatabaseProbe:
+    def __init__(self, get_engine: Callable[[], Optional[AsyncEngine]], timeout: float, cache_ttl: float):
+        self.get_engine = get_engine
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _cached(self) -> Optional[Dict[str, Any]]:
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+            return self._result
+        return None
+
+    async def check(self) -> Dict[str, Any]:
+        result = self._cached()
+        if result is not None:
+            return result
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # Параллельные пробы ждут одну проверку вместо того, чтобы занимать пул
+        async with self._lock:
+            result = self._cached()
+            if result is None:
+                result = await self._probe()
+                self._result = result
+                self._checked_at = time.monotonic()
+        return result
+
+    async def _probe(self) -> Dict[str, Any]:
+        engine = self.get_engine()
+        if engine is None:
+            return {"status": "error", "error": "Database is not initialized"}
+
+        started_at = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(self._query(engine), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return {"status": "timeout", "timeout_ms": round(self.timeout * 1000)}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started_at) * 1000, 2), **details}
+
+    async def _query(self, engine: AsyncEngine) -> Dict[str, Any]:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return {}
+
+
+class ReplicaProbe(DatabaseProbe):
+    # Если реплика догнала весь полученный WAL, отставания нет, даже когда на primary давно не было записей
+    LAG_QUERY = text(
+        "SELECT CASE "
+        "WHEN NOT pg_is_in_recovery() THEN 0 "
+        "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self, get_engine: Callable[[], Optional[AsyncEngine]], timeout: float, cache_ttl: float,
+                 max_lag: float):
+        super().__init__(get_engine, timeout, cache_ttl)
+        self.max_lag = max_lag
+
+    async def _query(self, engine: AsyncEngine) -> Dict[str, Any]:
+        async with engine.connect() as conn:
+            lag = float((await conn.execute(self.LAG_QUERY)).scalar() or 0)
+        db_replica_lag_seconds.set(lag)
+        return {"lag_seconds": round(lag, 3)}
+
+    async def is_healthy(self) -> bool:
+        result = await self.check()
+        return result["status"] == "ok" and result["lag_seconds"] <= self.max_lag
+
+
+def _primary_engine() -> Optional[AsyncEngine]:
+    from app.core import database
+    return database.async_engine
+
+
+def _replica_engine() -> Optional[AsyncEngine]:
+    from app.core import database
+    return database.replica_engine
+
+
+database_probe = DatabaseProbe(_primary_engine, settings.HEALTH_PROBE_TIMEOUT, settings.HEALTH_CACHE_TTL)
+replica_probe = ReplicaProbe(
+    _replica_engine, settings.HEALTH_PROBE_TIMEOUT, settings.HEALTH_CACHE_TTL, settings.REPLICA_MAX_LAG_SECONDS
+)
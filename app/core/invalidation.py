@@ -0,0 +1,84 @@
+import json
+import logging
+from typing import Awaitable, Callable, List, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.notifications import pg_listener, notify_payload_fits, WORKER_ID
+
+INVALIDATION_CHANNEL = "bms_invalidation"
+FLUSH_EVENT = "flush"
+PENDING_CHANGES = "pending_changes"
+
+logger = logging.getLogger("bms.invalidation")
+
+InvalidationHandler = Callable[[str, Sequence[str]], Awaitable[None]]
+
+_handlers: List[InvalidationHandler] = []
+
+
+def register_invalidation_handler(handler: InvalidationHandler) -> InvalidationHandler:
+    _handlers.append(handler)
+    return handler
+
+
+async def dispatch_invalidation(event: str, tags: Sequence[str]) -> None:
+    for handler in _handlers:
+        try:
+            await handler(event, tags)
+        except Exception:
+            logger.exception("Invalidation handler failed for %s", event)
+
+
+async def invalidate_response_cache(event: str, tags: Sequence[str]) -> None:
+    if event == FLUSH_EVENT:
+        await response_cache.clear()
+    else:
+        await response_cache.invalidate(*tags)
+
+
+async def publish_change(db: AsyncSession, event: str, *tags: str) -> None:
+    # Вызывается до commit: NOTIFY транзакционный и дойдёт до других воркеров ровно тогда,
+    # когда изменение станет видно. При откате не уйдёт ни само изменение, ни уведомление
+    payload = json.dumps({"origin": WORKER_ID, "event": event, "tags": list(tags)})
+    if not notify_payload_fits(payload):
+        # Тегов слишком много для одного уведомления: другие воркеры сбросят кеш целиком
+        logger.warning("Invalidation %s with %d tags is too large, flushing caches instead", event, len(tags))
+        payload = json.dumps({"origin": WORKER_ID, "event": FLUSH_EVENT, "tags": []})
+    await db.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+    db.info.setdefault(PENDING_CHANGES, []).append((event, tags))
+
+
+async def commit_changes(db: AsyncSession) -> None:
+    # Свой кеш сбрасываем после коммита: иначе параллельное чтение успело бы положить в него старые данные
+    await db.commit()
+    for event, tags in db.info.pop(PENDING_CHANGES, []):
+        if response_cache.backend.shared:
+            await invalidate_response_cache(event, tags)
+        await dispatch_invalidation(event, tags)
+
+
+def _on_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        print(f"Malformed invalidation payload: {payload}")
+        return
+
+    if message.get("origin") == WORKER_ID:
+        return
+
+    pg_listener.spawn(dispatch_invalidation(message.get("event", ""), message.get("tags", [])))
+
+
+async def _flush_after_reconnect() -> None:
+    await dispatch_invalidation(FLUSH_EVENT, ())
+
+
+pg_listener.listen(INVALIDATION_CHANNEL, _on_notification)
+pg_listener.on_reconnect(_flush_after_reconnect)
+
+if not response_cache.backend.shared:
+    register_invalidation_handler(invalidate_response_cache)
@@ -0,0 +1,54 @@
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+JobFactory = Callable[[], Awaitable[None]]
+
+
+class JobRunner:
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def is_running(self, key: str) -> bool:
+        return key in self._tasks
+
+    def submit(self, key: str, job: JobFactory) -> bool:
+        if key in self._tasks:
+            return False
+
+        task = asyncio.create_task(self._run(key, job))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return True
+
+    def submit_periodic(self, key: str, interval: float, job: JobFactory) -> bool:
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await job()
+                except Exception as e:
+                    print(f"Периодическая задача {key} завершилась с ошибкой: {str(e)}")
+
+        return self.submit(key, loop)
+
+    @staticmethod
+    async def _run(key: str, job: JobFactory) -> None:
+        print(f"Фоновая задача {key} запущена")
+        try:
+            await job()
+        except asyncio.CancelledError:
+            print(f"Фоновая задача {key} прервана")
+            raise
+        except Exception as e:
+            print(f"Фоновая задача {key} завершилась с ошибкой: {str(e)}")
+        else:
+            print(f"Фоновая задача {key} завершена")
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+job_runner = JobRunner()
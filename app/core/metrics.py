@@ -0,0 +1,289 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # counts[i] — число наблюдений в (buckets[i-1], buckets[i]], последний элемент — +Inf
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrics collector failed: {str(e)}")
+
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+))
+
+db_pool_size = registry.register(Gauge("db_pool_size", "Configured async pool size"))
+db_pool_checked_out = registry.register(Gauge("db_pool_checked_out", "Connections checked out of the async pool"))
+db_pool_overflow = registry.register(Gauge("db_pool_overflow", "Overflow connections of the async pool"))
+db_pool_wait_seconds = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+))
+db_replica_lag_seconds = registry.register(Gauge("db_replica_lag_seconds", "Read replica replay lag"))
+db_read_sessions_total = registry.register(Counter(
+    "db_read_sessions_total", "Read-only sessions by target database", ("target",)
+))
+
+cache_requests_total = registry.register(Counter(
+    "cache_requests_total", "Response cache lookups", ("result",)
+))
+cache_hit_ratio = registry.register(Gauge("cache_hit_ratio", "Response cache hit ratio since start"))
+auth_cache_requests_total = registry.register(Counter(
+    "auth_cache_requests_total", "Token to user lookups by cache result", ("result",)
+))
+
+password_hash_queue_depth = registry.register(Gauge(
+    "password_hash_queue_depth", "Password hash operations queued or running in the process pool"
+))
+password_hash_seconds = registry.register(Histogram(
+    "password_hash_seconds", "Password hash operation latency including queue wait", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+))
+password_hash_rejected_total = registry.register(Counter(
+    "password_hash_rejected_total", "Password hash operations rejected because the queue was full", ("operation",)
+))
+
+rate_limited_total = registry.register(Counter(
+    "rate_limited_total", "Requests rejected by the rate limiter", ("rule",)
+))
+
+db_pool_wait_recent_seconds = registry.register(Gauge(
+    "db_pool_wait_recent_seconds", "Decaying average of recent pool checkout waits used for load shedding"
+))
+load_shed_total = registry.register(Counter(
+    "load_shed_total", "Low-priority requests rejected while overloaded", ("path", "reason")
+))
+
+singleflight_requests_total = registry.register(Counter(
+    "singleflight_requests_total", "Coalesced reads by role: leader ran the query, shared awaited it", ("role",)
+))
+
+activity_events_total = registry.register(Counter(
+    "activity_events_total", "Team activity events by outcome: written to the log or dropped", ("result",)
+))
+activity_flush_size = registry.register(Histogram(
+    "activity_flush_size", "Team activity events inserted per flush",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000)
+))
+
+batch_subrequests_total = registry.register(Counter(
+    "batch_subrequests_total", "Sub-requests executed through /batch", ("method", "route", "status")
+))
+
+event_loop_lag_seconds = registry.register(Gauge("event_loop_lag_seconds", "Last measured event loop lag"))
+event_loop_lag_histogram = registry.register(Histogram(
+    "event_loop_lag_seconds_distribution", "Event loop lag distribution",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+))
+
+
+def _collect_pool_stats() -> None:
+    from app.core import database
+
+    if database.async_engine is None:
+        return
+
+    pool = database.async_engine.pool
+    db_pool_size.set(pool.size())
+    db_pool_checked_out.set(pool.checkedout())
+    db_pool_overflow.set(max(pool.overflow(), 0))
+
+
+def _collect_cache_ratio() -> None:
+    hits = cache_requests_total.value("hit")
+    total = hits + cache_requests_total.value("miss")
+    cache_hit_ratio.set(hits / total if total else 0.0)
+
+
+registry.add_collector(_collect_pool_stats)
+registry.add_collector(_collect_cache_ratio)
+
+
+class MetricsMiddleware:
+    def __init__(self, app, excluded_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started_at
+            http_requests_in_flight.dec()
+
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or scope.get("root_path") or "<unmatched>"
+            method = scope["method"]
+            http_requests_total.inc(method, route_label, str(status_code))
+            http_request_duration_seconds.observe(duration, method, route_label)
+
+
+class EventLoopLagMonitor:
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - started_at - self.interval, 0.0)
+            event_loop_lag_seconds.set(lag)
+            event_loop_lag_histogram.observe(lag)
+
+
+event_loop_monitor = EventLoopLagMonitor()
@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import asyncpg
+
+from app.core.config import settings
+
+NotificationCallback = Callable[[str], None]
+ReconnectCallback = Callable[[], Awaitable[None]]
+
+WORKER_ID = uuid.uuid4().hex
+# pg_notify отвергает сообщения от 8000 байт, а ошибка всплывает только в транзакции отправителя
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+
+def notify_payload_fits(payload: str) -> bool:
+    return len(payload.encode()) <= NOTIFY_PAYLOAD_LIMIT
+
+
+class PostgresListener:
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._channels: Dict[str, NotificationCallback] = {}
+        self._reconnect_callbacks: List[ReconnectCallback] = []
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncpg.Connection] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def listen(self, channel: str, callback: NotificationCallback) -> None:
+        self._channels[channel] = callback
+
+    def on_reconnect(self, callback: ReconnectCallback) -> None:
+        self._reconnect_callbacks.append(callback)
+
+    def spawn(self, coroutine: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _run(self) -> None:
+        delay = 1
+        while True:
+            disconnected = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(self.dsn)
+                self._connection.add_termination_listener(lambda connection: disconnected.set())
+                for channel, callback in self._channels.items():
+                    await self._connection.add_listener(channel, self._make_listener(callback))
+                print(f"Listening for notifications on {', '.join(self._channels)}")
+
+                # События, пропущенные без подключения, восстановить нельзя
+                for reconnect_callback in self._reconnect_callbacks:
+                    await reconnect_callback()
+                delay = 1
+                await disconnected.wait()
+                print("Notification listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Notification listener error: {str(e)}")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    @staticmethod
+    def _make_listener(callback: NotificationCallback):
+        def listener(connection, pid: int, channel: str, payload: str) -> None:
+            callback(payload)
+
+        return listener
+
+
+pg_listener = PostgresListener(settings.DATABASE_URL)
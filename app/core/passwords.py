@@ -0,0 +1,83 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi_users.password import PasswordHelper
+
+from app.core.config import settings
+from app.core.metrics import password_hash_queue_depth, password_hash_rejected_total, password_hash_seconds
+
+_helper: Optional[PasswordHelper] = None
+
+
+def _password_helper() -> PasswordHelper:
+    # Создаётся отдельно в каждом процессе пула
+    global _helper
+    if _helper is None:
+        _helper = PasswordHelper()
+    return _helper
+
+
+def _hash(password: str) -> str:
+    return _password_helper().hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return _password_helper().verify_and_update(password, hashed_password)
+
+
+class PasswordHashPool:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._executor is not None:
+            return
+        # spawn, а не fork: дочерний процесс не наследует event loop и соединения с БД
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            return func(*args)
+
+        if self._pending >= self.max_queue:
+            password_hash_rejected_total.inc(operation)
+            raise HTTPException(
+                status_code=503,
+                detail="Too many authentication requests, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        password_hash_queue_depth.set(self._pending)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            password_hash_queue_depth.set(self._pending)
+            password_hash_seconds.observe(time.perf_counter() - started, operation)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run("verify", _verify_and_update, password, hashed_password)
+
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.notifications import pg_listener, notify_payload_fits, WORKER_ID
+
+logger = logging.getLogger("bms.events")
+
+EVENTS_CHANNEL = "bms_events"
+RESYNC_EVENT = "resync"
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, topics: Iterable[str]):
+        self.topics: Set[str] = set(topics)
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, event: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Медленный клиент: вместо потерянных дельт он получит команду перечитать данные
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait({"type": RESYNC_EVENT})
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event["type"] == RESYNC_EVENT:
+            self.overflowed = False
+        return event
+
+
+class EventBroker:
+    def __init__(self):
+        self._topics: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def update_topics(self, subscription: Subscription, topics: Iterable[str]) -> None:
+        self.unsubscribe(subscription)
+        subscription.topics = set(topics)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+
+    def publish_local(self, topics: Iterable[str], event: Dict[str, Any]) -> None:
+        delivered: Set[Subscription] = set()
+        for topic in topics:
+            for subscription in self._topics.get(topic, ()):
+                if subscription not in delivered:
+                    subscription.push(event)
+                    delivered.add(subscription)
+
+    def broadcast(self, event: Dict[str, Any]) -> None:
+        for subscription in {s for subscribers in self._topics.values() for s in subscribers}:
+            subscription.push(event)
+
+
+event_broker = EventBroker()
+
+
+def encode_event(event: Dict[str, Any]) -> str:
+    return json.dumps(event, default=_json_default, ensure_ascii=False)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
+
+
+def _ids_only(event: Dict[str, Any]) -> Dict[str, Any]:
+    # Для других воркеров событие урезается до идентификаторов: остальное клиент дочитает через API
+    ids = {key: value for key, value in event.items() if key == "id" or key.endswith("_id")}
+    return {"type": event["type"], "partial": True, **ids}
+
+
+async def publish_event(db: AsyncSession, event_type: str, topics: Iterable[str], **data: Any) -> None:
+    topics = list(topics)
+    event = json.loads(encode_event({"type": event_type, **data}))
+    event_broker.publish_local(topics, event)
+
+    payload = encode_event({"origin": WORKER_ID, "topics": topics, "event": event})
+    if not notify_payload_fits(payload):
+        payload = encode_event({"origin": WORKER_ID, "topics": topics, "event": _ids_only(event)})
+    if not notify_payload_fits(payload):
+        logger.error("Event %s for %d topics is too large to send to other workers", event_type, len(topics))
+        return
+
+    try:
+        await db.execute(select(func.pg_notify(EVENTS_CHANNEL, payload)))
+        await db.commit()
+    except Exception:
+        logger.exception("Failed to publish event %s", event_type)
+        await db.rollback()
+
+
+def _on_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        print(f"Malformed event payload: {payload}")
+        return
+
+    if message.get("origin") == WORKER_ID:
+        return
+
+    event_broker.publish_local(message.get("topics", []), message.get("event", {}))
+
+
+async def _resync_after_reconnect() -> None:
+    event_broker.broadcast({"type": RESYNC_EVENT})
+
+
+pg_listener.listen(EVENTS_CHANNEL, _on_notification)
+pg_listener.on_reconnect(_resync_after_reconnect)
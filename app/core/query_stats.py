@@ -0,0 +1,108 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger("bms.sql")
+
+request_query_stats: ContextVar[Optional["QueryStats"]] = ContextVar("request_query_stats", default=None)
+
+
+class QueryStats:
+    __slots__ = ("count", "duration", "rows", "statements")
+
+    def __init__(self, track_statements: bool):
+        self.count = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.statements: Optional[Counter] = Counter() if track_statements else None
+
+    def record(self, statement: str, duration: float, rowcount: int) -> None:
+        self.count += 1
+        self.duration += duration
+        if rowcount > 0:
+            self.rows += rowcount
+        if self.statements is not None:
+            self.statements[statement] += 1
+
+    def repeated_statements(self, threshold: int):
+        if self.statements is None:
+            return []
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+
+def install_query_hooks(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._bms_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = request_query_stats.get()
+        started_at = getattr(context, "_bms_started_at", None)
+        if stats is not None and started_at is not None:
+            stats.record(statement, time.perf_counter() - started_at, cursor.rowcount)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(track_statements=settings.SQL_N_PLUS_ONE_THRESHOLD > 0)
+        token = request_query_stats.set(stats)
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries, {stats.rows} rows", '
+                    f"app;dur={(time.perf_counter() - started_at) * 1000:.1f}"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_query_stats.reset(token)
+            self._log(scope, status_code, stats, time.perf_counter() - started_at)
+
+    @staticmethod
+    def _log(scope, status_code: int, stats: QueryStats, duration: float) -> None:
+        logger.info(json.dumps({
+            "event": "request",
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "db_queries": stats.count,
+            "db_ms": round(stats.duration * 1000, 2),
+            "db_rows": stats.rows,
+        }))
+
+        for statement, count in stats.repeated_statements(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            logger.warning(json.dumps({
+                "event": "n_plus_one",
+                "method": scope["method"],
+                "path": scope["path"],
+                "count": count,
+                "statement": " ".join(statement.split()),
+            }, ensure_ascii=False))
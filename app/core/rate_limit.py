@@ -0,0 +1,182 @@
+import json
+import math
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+
+from app.core.cache import RedisConnection
+from app.core.config import settings
+from app.core.metrics import rate_limited_total
+from app.core.replica import credential_key
+
+
+class RateLimitRule:
+    def __init__(self, method: str, path: str, capacity: int, period: float, per: str):
+        self.method = method.upper()
+        self.path = path
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.per = per
+        self.name = f"{self.method} {path} {per}"
+        pattern = re.sub(r"\\{[^/]+?\\}", "[^/]+", re.escape(path))
+        self.pattern = re.compile(pattern + "/?")
+
+    def matches(self, path: str) -> bool:
+        return self.pattern.fullmatch(path) is not None
+
+
+def parse_rules(value: str) -> List[RateLimitRule]:
+    # Формат: "METHOD /path=COUNT/SECONDS:ip|user", правила разделяются ";"
+    rules = []
+    for item in value.split(";"):
+        item = item.strip()
+        if not item:
+            continue
+        route, _, limit = item.rpartition("=")
+        method, _, path = route.strip().partition(" ")
+        limit, _, per = limit.partition(":")
+        count, _, period = limit.partition("/")
+        rules.append(RateLimitRule(method, path.strip(), int(count), float(period), per.strip() or "ip"))
+    return rules
+
+
+class MemoryRateLimitBackend:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # ключ -> [токены, время обновления, момент полного заполнения]
+        self._buckets: Dict[str, List[float]] = {}
+
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._sweep(now)
+            tokens = float(capacity)
+            bucket = self._buckets[key] = [tokens, now, now]
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+
+        bucket[0] = tokens
+        bucket[1] = now
+        bucket[2] = now + (capacity - tokens) / rate
+        return retry_after
+
+    def _sweep(self, now: float) -> None:
+        # Полный бак ничем не отличается от отсутствующего, его можно забыть
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        while len(self._buckets) >= self.max_keys:
+            del self._buckets[next(iter(self._buckets))]
+
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitBackend:
+    def __init__(self, url: str, namespace: str = "bms"):
+        self.connection = RedisConnection(url)
+        self.namespace = namespace
+
+    async def acquire(self, key: str, capacity: int, rate: float) -> float:
+        retry_after = await self.connection.execute(
+            "EVAL", TOKEN_BUCKET_SCRIPT, 1, f"{self.namespace}:ratelimit:{key}", capacity, rate, time.time()
+        )
+        return float(retry_after)
+
+
+def create_rate_limit_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_URL)
+    return MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+class RateLimiter:
+    def __init__(self, rules: List[RateLimitRule], backend):
+        self.backend = backend
+        self._rules: Dict[str, List[RateLimitRule]] = {}
+        for rule in rules:
+            self._rules.setdefault(rule.method, []).append(rule)
+
+    def match(self, method: str, path: str) -> List[RateLimitRule]:
+        return [rule for rule in self._rules.get(method, ()) if rule.matches(path)]
+
+    @staticmethod
+    def client_key(rule: RateLimitRule, scope) -> str:
+        if rule.per == "user":
+            # Без обращения к БД: пользователя представляет хэш его токена
+            key = credential_key(Headers(scope=scope).get("authorization"))
+            if key is not None:
+                return f"user:{key}"
+        # За прокси адрес клиента подставляет uvicorn --proxy-headers
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def check(self, scope) -> Optional[Tuple[RateLimitRule, float]]:
+        for rule in self.match(scope["method"], scope["path"]):
+            key = f"{rule.name}:{self.client_key(rule, scope)}"
+            try:
+                retry_after = await self.backend.acquire(key, rule.capacity, rule.rate)
+            except Exception as e:
+                print(f"Rate limit check failed: {str(e)}")
+                return None
+            if retry_after > 0:
+                return rule, retry_after
+        return None
+
+
+rate_limiter = RateLimiter(parse_rules(settings.RATE_LIMIT_RULES), create_rate_limit_backend())
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        limited = await self.limiter.check(scope)
+        if limited is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule, retry_after = limited
+        rate_limited_total.inc(rule.name)
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
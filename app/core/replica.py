@@ -0,0 +1,119 @@
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
+
+from fastapi.requests import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core import database
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.health import replica_probe
+from app.core.metrics import db_read_sessions_total
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+STICKY_COOKIE = "bms_primary_until"
+READ_LAG_BOUND = "read_lag_bound"
+
+
+def credential_key(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    return hashlib.blake2b(authorization.encode(), digest_size=16).hexdigest()
+
+
+class PrimaryStickiness:
+    def __init__(self, window: int, max_entries: int = 10000):
+        self.window = window
+        self.max_entries = max_entries
+        self._until: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark(self, key: str) -> None:
+        self._until[key] = time.monotonic() + self.window
+        self._until.move_to_end(key)
+        while len(self._until) > self.max_entries:
+            self._until.popitem(last=False)
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        until = self._until.get(key)
+        if until is None:
+            return False
+        if until < time.monotonic():
+            del self._until[key]
+            return False
+        return True
+
+
+primary_stickiness = PrimaryStickiness(settings.REPLICA_STICKINESS_SECONDS)
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+                scope["type"] != "http"
+                or scope["method"] in SAFE_METHODS
+                or not settings.REPLICA_DATABASE_URL
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_stickiness(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                # Cookie переживает переход запроса на другой воркер, локальная метка — клиентов без cookie
+                headers.append(
+                    "Set-Cookie",
+                    f"{STICKY_COOKIE}=1; Max-Age={settings.REPLICA_STICKINESS_SECONDS}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                key = credential_key(Headers(scope=scope).get("authorization"))
+                if key is not None:
+                    primary_stickiness.mark(key)
+            await send(message)
+
+        await self.app(scope, receive, send_with_stickiness)
+
+
+async def should_read_from_replica(request: Request) -> bool:
+    if database.replica_session_maker is None:
+        return False
+    if STICKY_COOKIE in request.cookies:
+        return False
+    if primary_stickiness.is_sticky(credential_key(request.headers.get("authorization"))):
+        return False
+    return await replica_probe.is_healthy()
+
+
+@asynccontextmanager
+async def open_read_session(use_replica: bool) -> AsyncGenerator[AsyncSession, None]:
+    if use_replica:
+        db_read_sessions_total.inc("replica")
+        async with database.replica_session_maker() as session:
+            session.info[READ_LAG_BOUND] = replica_probe.max_lag
+            yield session
+    else:
+        db_read_sessions_total.inc("primary")
+        async with database.async_session_maker() as session:
+            yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with open_read_session(await should_read_from_replica(request)) as session:
+        yield session
+
+
+def read_started_at(session: AsyncSession) -> float:
+    # Снимок реплики может быть старше момента чтения на допустимое отставание,
+    # поэтому кэш не должен принять его после более поздней инвалидации
+    return response_cache.clock() - session.info.get(READ_LAG_BOUND, 0)
+
+
+def read_target(session: AsyncSession) -> str:
+    return "replica" if READ_LAG_BOUND in session.info else "primary"
@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Без пакета orjson тихий откат на pydantic скрыл бы, что настройка не действует
+if settings.JSON_ENCODER == "orjson" and orjson is None:
+    raise RuntimeError("JSON_ENCODER=orjson requires the orjson package")
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(model_type: Any) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def dump_json(model_type: Any, data: Any, encoder: Optional[str] = None) -> bytes:
+    encoder = encoder or settings.JSON_ENCODER
+    if encoder == "orjson" and orjson is None:
+        raise RuntimeError("JSON_ENCODER=orjson requires the orjson package")
+    adapter = get_type_adapter(model_type)
+
+    if type(data) is not model_type:
+        data = adapter.validate_python(data, from_attributes=True)
+
+    if encoder == "orjson":
+        return orjson.dumps(adapter.dump_python(data, by_alias=True), option=orjson.OPT_UTC_Z)
+    return adapter.dump_json(data, by_alias=True)
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def render_response(model_type: Any, data: Any) -> Any:
+    if not settings.JSON_FAST_PATH or isinstance(data, Response):
+        return data
+    return json_response(dump_json(model_type, data))
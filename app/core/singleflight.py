@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.metrics import singleflight_requests_total
+
+
+class LeaderCancelled(Exception):
+    pass
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is not None:
+            singleflight_requests_total.inc("shared")
+            try:
+                return await asyncio.shield(future)
+            except LeaderCancelled:
+                # Ведущий запрос оборвал клиент — читаем сами, своей сессией
+                return await fetch()
+
+        singleflight_requests_total.inc("leader")
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            self._fail(future, LeaderCancelled())
+            raise
+        except Exception as e:
+            self._fail(future, e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    @staticmethod
+    def _fail(future: asyncio.Future, error: Exception) -> None:
+        future.set_exception(error)
+        # Ожидающих может не быть, исключение помечаем полученным
+        future.exception()
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,127 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+import jwt
+
+from app.core.config import settings
+from app.core.invalidation import register_invalidation_handler, FLUSH_EVENT
+from app.core.metrics import auth_cache_requests_total
+
+
+class UserSnapshot:
+    # Только поля, которые читают обработчики; ORM-объект с сессией в кэше не храним
+    __slots__ = ("id", "email", "first_name", "last_name", "role", "is_active", "is_superuser", "is_verified")
+
+    def __init__(self, user):
+        for name in self.__slots__:
+            setattr(self, name, getattr(user, name))
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _token_expires_at(token: str) -> Optional[float]:
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.PyJWTError:
+        return None
+    return float(exp) if exp else None
+
+
+class TokenUserCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, UserSnapshot]]" = OrderedDict()
+        self._user_keys: Dict[int, Set[bytes]] = {}
+        self._invalidated_at: Dict[int, float] = {}
+        self._cleared_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            auth_cache_requests_total.inc("miss")
+            return None
+
+        expires_at, user = entry
+        if expires_at < time.time():
+            self._remove(key)
+            auth_cache_requests_total.inc("miss")
+            return None
+
+        self._entries.move_to_end(key)
+        auth_cache_requests_total.inc("hit")
+        return user
+
+    def set(self, token: str, user: UserSnapshot, started_at: float) -> None:
+        # Пользователя изменили, пока мы читали его из БД, — такой снимок уже устарел
+        if self._cleared_at >= started_at or self._invalidated_at.get(user.id, 0) >= started_at:
+            return
+
+        expires_at = time.time() + self.ttl
+        token_expires_at = _token_expires_at(token)
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        key = _token_key(token)
+        self._remove(key)
+        self._entries[key] = (expires_at, user)
+        self._user_keys.setdefault(user.id, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        now = time.time()
+        self._invalidated_at[user_id] = now
+        for key in self._user_keys.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+        if len(self._invalidated_at) > self.max_entries:
+            horizon = now - self.ttl
+            self._invalidated_at = {
+                user_id: invalidated_at
+                for user_id, invalidated_at in self._invalidated_at.items()
+                if invalidated_at >= horizon
+            }
+
+    def clear(self) -> None:
+        self._cleared_at = time.time()
+        self._entries.clear()
+        self._user_keys.clear()
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._user_keys.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[entry[1].id]
+
+
+USER_CHANGED_EVENT = "user_changed"
+
+token_user_cache = TokenUserCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL)
+
+
+@register_invalidation_handler
+async def invalidate_token_user_cache(event: str, tags: Sequence[str]) -> None:
+    if event == FLUSH_EVENT:
+        token_user_cache.clear()
+        return
+    if event != USER_CHANGED_EVENT:
+        return
+
+    for tag in tags:
+        if tag.startswith("user:") and tag[5:].isdigit():
+            token_user_cache.invalidate_user(int(tag[5:]))
@@ -1,12 +1,15 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import Depends, Request
-from fastapi_users import BaseUserManager, IntegerIDMixin
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager, IntegerIDMixin, exceptions, schemas
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_async_session
+from app.core.invalidation import publish_change, commit_changes
+from app.core.passwords import password_pool
 from app.models.user import User
 
 
@@ -14,6 +17,57 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     reset_password_token_secret = settings.SECRET_KEY
     verification_token_secret = settings.SECRET_KEY
 
+    # Хэширование и проверка паролей выполняются в пуле процессов, а не в event loop
+    async def create(
+            self,
+            user_create: schemas.UC,
+            safe: bool = False,
+            request: Optional[Request] = None,
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await password_pool.hash(password)
+
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Хэшируем впустую, чтобы время ответа не выдавало существование email
+            await password_pool.hash(credentials.password)
+            return None
+
+        verified, updated_password_hash = await password_pool.verify_and_update(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
+
+    async def _update(self, user: User, update_dict: Dict[str, Any]) -> User:
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {name: value for name, value in update_dict.items() if name != "password"}
+            update_dict["hashed_password"] = await password_pool.hash(password)
+        return await super()._update(user, update_dict)
+
     async def on_after_register(
             self,
             user: User,
@@ -21,6 +75,24 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     ):
         print(f"User {user.id} has registered.")
 
+    async def on_after_update(
+            self,
+            user: User,
+            update_dict: Dict[str, Any],
+            request: Optional[Request] = None,
+    ):
+        # fastapi-users уже закоммитил изменение, поэтому уведомление уходит отдельной короткой транзакцией
+        await publish_change(self.user_db.session, "user_changed", f"user:{user.id}")
+        await commit_changes(self.user_db.session)
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None):
+        await publish_change(self.user_db.session, "user_changed", f"user:{user.id}")
+        await commit_changes(self.user_db.session)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None):
+        await publish_change(self.user_db.session, "user_changed", f"user:{user.id}")
+        await commit_changes(self.user_db.session)
+
     async def on_after_forgot_password(
             self,
             user: User,
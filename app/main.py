@@ -1,26 +1,75 @@
+import logging
+
 from fastapi import FastAPI
 from fastapi.requests import Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import text
+from sqlalchemy.orm.exc import StaleDataError
 
+from app.core.activity import activity_log
 from app.core.admin import setup_admin
+from app.core.admission import LoadSheddingMiddleware
 from app.core.auth import current_active_user
 from app.core.config import settings
-from app.core.database import sync_engine, init_db, create_table
+from app.core.database import init_db, check_schema_revision, warm_up_pool, dispose_engines
+from app.core.jobs import job_runner
+from app.core.metrics import MetricsMiddleware, event_loop_monitor, registry
+from app.core.notifications import pg_listener
+from app.core.passwords import password_pool
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.replica import ReadYourWritesMiddleware
 from app.core.templates import templates
-from app.routers import auth, teams, tasks, evaluations, meetings, calendar, users
+from app.routers import auth, teams, tasks, evaluations, meetings, calendar, users, events, health, dashboard, batch, sync
+from app.utils.archive import schedule_task_archival
+from app.utils.sync import schedule_tombstone_purge
+from app.utils.teams import resume_team_deletions
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(LoadSheddingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    # Версия строки сменилась между чтением и записью: запрос можно повторить с актуальными данными
+    return JSONResponse(status_code=412, content={"detail": "Resource was modified by another request"})
 
 
 @app.on_event("startup")
 async def startup_event():
     await init_db()
-    await create_table()
+    if not await check_schema_revision():
+        # На старой схеме первые же запросы к новым столбцам и таблицам падали бы с 500
+        raise RuntimeError("Database schema revision does not match the code, run `alembic upgrade head`")
+    await warm_up_pool(settings.DB_POOL_WARMUP)
+    password_pool.start()
+    activity_log.start()
+    pg_listener.start()
+    event_loop_monitor.start()
+    if settings.TASK_ARCHIVE_INTERVAL_SECONDS > 0:
+        schedule_task_archival()
+    if settings.SYNC_TOMBSTONE_PURGE_INTERVAL_SECONDS > 0:
+        schedule_tombstone_purge()
+    await resume_team_deletions()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await job_runner.stop()
+    await event_loop_monitor.stop()
+    await pg_listener.stop()
+    await activity_log.stop()
+    await dispose_engines()
+    password_pool.shutdown()
 
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -32,6 +81,11 @@ app.include_router(evaluations.router)
 app.include_router(meetings.router)
 app.include_router(calendar.router)
 app.include_router(users.router)
+app.include_router(events.router)
+app.include_router(health.router)
+app.include_router(dashboard.router)
+app.include_router(batch.router)
+app.include_router(sync.router)
 
 admin = setup_admin(app)
 
@@ -45,11 +99,6 @@ async def root(request: Request):
         return templates.TemplateResponse("index.html", {"request": request})
 
 
-@app.get("/health")
-async def health_check():
-    try:
-        with sync_engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        return {"status": "OK", "database": "Connected"}
-    except Exception as e:
-        return {"status": "Error", "database": str(e)}
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -2,4 +2,7 @@ from .user import User
 from .team import Team, UserTeam
 from .task import Task, TaskComment
 from .meeting import Meeting, MeetingParticipant
-from .evaluation import Evaluation
\ No newline at end of file
+from .evaluation import Evaluation
+from .archive import ArchivedTask, ArchivedTaskComment, ArchivedEvaluation
+from .sync import SyncTombstone
+from .activity import TeamActivity
\ No newline at end of file
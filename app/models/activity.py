@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.database import Base
+
+
+# Журнал только дописывается и пишется пачками в фоне, поэтому внешних ключей нет:
+# событие не должно ронять всю пачку, если команду или пользователя успели удалить
+class TeamActivity(Base):
+    __tablename__ = "team_activity"
+
+    id = Column(BigInteger, primary_key=True)
+    team_id = Column(Integer, nullable=False)
+    actor_id = Column(Integer)
+    action = Column(String(32), nullable=False)
+    entity_id = Column(Integer)
+    data = Column(JSONB)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_team_activity_team_id_id", team_id, id),
+    )
@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.models.task import TaskStatus
+
+
+# Завершённые задачи, перенесённые из рабочих таблиц. Идентификаторы сохраняются исходные,
+# поэтому ссылки на /tasks/{id} продолжают работать с include_archived=true
+class ArchivedTask(Base):
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(Text)
+    status = Column(Enum(TaskStatus))
+    deadline = Column(DateTime(timezone=True))
+
+    creator_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), index=True)
+
+    creator = relationship("User", foreign_keys=[creator_id])
+    assignee = relationship("User", foreign_keys=[assignee_id])
+    team = relationship("Team")
+    comments = relationship("ArchivedTaskComment", back_populates="task", passive_deletes=True)
+    evaluation = relationship("ArchivedEvaluation", back_populates="task", uselist=False, passive_deletes=True)
+
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ArchivedTaskComment(Base):
+    __tablename__ = "task_comments_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    content = Column(Text, nullable=False)
+    task_id = Column(Integer, ForeignKey("tasks_archive.id", ondelete="CASCADE"), index=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+
+    task = relationship("ArchivedTask", back_populates="comments")
+    author = relationship("User")
+
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ArchivedEvaluation(Base):
+    __tablename__ = "evaluations_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    rating = Column(SmallInteger, nullable=False)
+    comment = Column(Text)
+
+    task_id = Column(Integer, ForeignKey("tasks_archive.id", ondelete="CASCADE"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    evaluator_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+
+    task = relationship("ArchivedTask", back_populates="evaluation")
+
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -12,9 +12,9 @@ class Evaluation(Base):
     rating = Column(SmallInteger, nullable=False)
     comment = Column(Text)
 
-    task_id = Column(Integer, ForeignKey("tasks.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))  # Кого оценивают
-    evaluator_id = Column(Integer, ForeignKey("users.id"))  # Кто оценивает
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)  # Кого оценивают
+    evaluator_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)  # Кто оценивает
 
     task = relationship("Task", back_populates="evaluation")
     user = relationship("User", back_populates="evaluations_received", foreign_keys=[user_id])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -14,21 +14,27 @@ class Meeting(Base):
     start_time = Column(DateTime(timezone=True), nullable=False)
     end_time = Column(DateTime(timezone=True), nullable=False)
 
-    organizer_id = Column(Integer, ForeignKey("users.id"))
-    team_id = Column(Integer, ForeignKey("teams.id"))
+    organizer_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), index=True)
     organizer = relationship("User", back_populates="created_meetings", foreign_keys=[organizer_id])
     team = relationship("Team", back_populates="meetings")
-    participants = relationship("MeetingParticipant", back_populates="meeting")
+    participants = relationship("MeetingParticipant", back_populates="meeting", passive_deletes=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        Index("ix_meetings_team_id_updated_at", team_id, updated_at, id),
+    )
 
 
 class MeetingParticipant(Base):
     __tablename__ = "meeting_participants"
 
     id = Column(Integer, primary_key=True, index=True)
-    meeting_id = Column(Integer, ForeignKey("meetings.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
 
     meeting = relationship("Meeting", back_populates="participants")
     user = relationship("User", back_populates="meetings")
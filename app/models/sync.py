@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+# Следы удалённых строк для /sync. Пишутся триггерами в БД (миграция 0005), поэтому
+# учитывают и каскадные удаления, и архивацию, и массовые операции из админки.
+# Внешних ключей нет: след должен пережить удаление команды и пользователя.
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    team_id = Column(Integer)
+    user_id = Column(Integer)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_deleted_at", deleted_at, id),
+    )
@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -22,18 +22,32 @@ class Task(Base):
     status = Column(Enum(TaskStatus), default=TaskStatus.OPEN)
     deadline = Column(DateTime(timezone=True))
 
-    creator_id = Column(Integer, ForeignKey("users.id"))
-    assignee_id = Column(Integer, ForeignKey("users.id"))
-    team_id = Column(Integer, ForeignKey("teams.id"))
+    creator_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), index=True)
 
     creator = relationship("User", foreign_keys=[creator_id], back_populates="created_tasks")
     assignee = relationship("User", foreign_keys=[assignee_id], back_populates="assigned_tasks")
     team = relationship("Team", back_populates="tasks")
-    comments = relationship("TaskComment", back_populates="task")
-    evaluation = relationship("Evaluation", back_populates="task", uselist=False)
+    comments = relationship("TaskComment", back_populates="task", passive_deletes=True)
+    evaluation = relationship("Evaluation", back_populates="task", uselist=False, passive_deletes=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Оптимистическая блокировка: UPDATE идёт с условием на версию и увеличивает её
+    version = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
+    # Кандидаты на архивацию: частичный индекс не растёт за счёт открытых задач
+    __table_args__ = (
+        Index(
+            "ix_tasks_completed_updated_at", updated_at,
+            postgresql_where=(status == TaskStatus.COMPLETED),
+        ),
+        # Дельта-синхронизация: изменения команды по порядку (updated_at, id)
+        Index("ix_tasks_team_id_updated_at", team_id, updated_at, id),
+    )
 
 
 class TaskComment(Base):
@@ -41,10 +55,15 @@ class TaskComment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
-    task_id = Column(Integer, ForeignKey("tasks.id"))
-    author_id = Column(Integer, ForeignKey("users.id"))
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
 
     task = relationship("Task", back_populates="comments")
     author = relationship("User", back_populates="task_comments")
 
     created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_task_comments_updated_at", updated_at, id),
+    )
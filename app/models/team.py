@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Index, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,23 +13,34 @@ class Team(Base):
     description = Column(String)
     invite_code = Column(String, unique=True)
 
-    members = relationship("UserTeam", back_populates="team", lazy="selectin")
-    tasks = relationship("Task", back_populates="team")
-    meetings = relationship("Meeting", back_populates="team")
+    # members всегда загружены, поэтому "all": иначе ORM обнулит team_id вместо каскада в БД
+    members = relationship("UserTeam", back_populates="team", lazy="selectin", passive_deletes="all")
+    tasks = relationship("Task", back_populates="team", passive_deletes=True)
+    meetings = relationship("Meeting", back_populates="team", passive_deletes=True)
 
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, server_default="1")
+    # Команда удаляется в фоне: для чтения её уже нет, а после перезапуска удаление продолжится
+    deleting = Column(Boolean, nullable=False, server_default=false())
+
+    __mapper_args__ = {"version_id_col": version}
 
 
 class UserTeam(Base):
     __tablename__ = "user_teams"
+    __table_args__ = (
+        Index("ix_user_teams_user_id_team_id", "user_id", "team_id"),
+        Index("ix_user_teams_team_id_updated_at", "team_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    team_id = Column(Integer, ForeignKey("teams.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), index=True)
     role = Column(String, default="member")
 
     user = relationship("User", back_populates="teams")
     team = relationship("Team", back_populates="members")
 
     created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -14,14 +14,19 @@ class User(Base, SQLAlchemyBaseUserTable):
     last_name = Column(String)
     role = Column(String, default="user")
 
-    teams = relationship("UserTeam", back_populates="user")
-    created_tasks = relationship("Task", back_populates="creator", foreign_keys="[Task.creator_id]")
-    assigned_tasks = relationship("Task", back_populates="assignee", foreign_keys="[Task.assignee_id]")
-    task_comments = relationship("TaskComment", back_populates="author")
-    evaluations_received = relationship("Evaluation", back_populates="user", foreign_keys="[Evaluation.user_id]")
-    evaluations_given = relationship("Evaluation", back_populates="evaluator", foreign_keys="[Evaluation.evaluator_id]")
-    meetings = relationship("MeetingParticipant", back_populates="user")
-    created_meetings = relationship("Meeting", back_populates="organizer", foreign_keys="[Meeting.organizer_id]")
+    teams = relationship("UserTeam", back_populates="user", passive_deletes=True)
+    created_tasks = relationship("Task", back_populates="creator", foreign_keys="[Task.creator_id]",
+                                 passive_deletes=True)
+    assigned_tasks = relationship("Task", back_populates="assignee", foreign_keys="[Task.assignee_id]",
+                                  passive_deletes=True)
+    task_comments = relationship("TaskComment", back_populates="author", passive_deletes=True)
+    evaluations_received = relationship("Evaluation", back_populates="user", foreign_keys="[Evaluation.user_id]",
+                                        passive_deletes=True)
+    evaluations_given = relationship("Evaluation", back_populates="evaluator", foreign_keys="[Evaluation.evaluator_id]",
+                                     passive_deletes=True)
+    meetings = relationship("MeetingParticipant", back_populates="user", passive_deletes=True)
+    created_meetings = relationship("Meeting", back_populates="organizer", foreign_keys="[Meeting.organizer_id]",
+                                    passive_deletes=True)
 
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
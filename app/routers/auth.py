@@ -3,7 +3,7 @@ from fastapi.requests import Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
-from app.core.auth import fastapi_users, auth_backend
+from app.core.auth import fastapi_users, auth_backend, current_active_user
 from app.models.user import User
 from app.schemas.user import UserRead, UserCreate, UserUpdate
 
@@ -43,5 +43,5 @@ async def register_page(request: Request):
 
 
 @router.get("/me", response_model=UserRead)
-async def get_current_user(user: User = Depends(fastapi_users.current_user(active=True))):
+async def get_current_user(user: User = Depends(current_active_user)):
     return user
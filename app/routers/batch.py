@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.requests import Request
+
+from app.core.auth import current_active_user
+from app.core.batch import run_batch
+from app.core.config import settings
+from app.core.serialization import dump_json, json_response
+from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.post("", response_model=BatchResponse)
+async def execute_batch(
+        request: Request,
+        batch: BatchRequest,
+        user: User = Depends(current_active_user)
+):
+    if not batch.requests:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch cannot contain more than {settings.BATCH_MAX_REQUESTS} requests"
+        )
+
+    responses = await run_batch(request.scope, user, batch.requests)
+    return json_response(dump_json(BatchResponse, BatchResponse(responses=responses)))
@@ -7,7 +7,7 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import current_active_user
-from app.core.database import get_async_session
+from app.core.replica import get_read_session
 from app.core.templates import templates
 from app.models.user import User
 from app.schemas.calendar import CalendarResponse, CalendarViewType
@@ -65,10 +65,11 @@ async def get_calendar_events_api(
         start: datetime = Query(..., description="Начало периода"),
         end: datetime = Query(..., description="Конец периода"),
         view: CalendarViewType = Query(CalendarViewType.MONTH, description="Вид календаря"),
+        include_archived: bool = Query(False, description="Включать задачи из архива"),
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
-    events = await get_user_calendar_events(db, user.id, start, end)
+    events = await get_user_calendar_events(db, user.id, start, end, include_archived)
 
     return CalendarResponse(
         events=events,
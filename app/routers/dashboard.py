@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.requests import Request
+
+from app.core.auth import current_active_user
+from app.core.replica import open_read_session, should_read_from_replica
+from app.core.serialization import dump_json, json_response
+from app.models.user import User
+from app.schemas.dashboard import DashboardSummary
+from app.utils.dashboard import (
+    get_dashboard_evaluations,
+    get_dashboard_meetings,
+    get_dashboard_tasks,
+    get_dashboard_teams,
+)
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+        request: Request,
+        tasks_limit: int = Query(5, ge=0, le=50, description="Сколько открытых задач показать"),
+        meetings_limit: int = Query(5, ge=0, le=50, description="Сколько ближайших встреч показать"),
+        period_days: int = Query(30, ge=1, le=365, description="Период статистики оценок"),
+        user: User = Depends(current_active_user)
+):
+    use_replica = await should_read_from_replica(request)
+    timings = {}
+
+    # Секции независимы, поэтому каждая берёт своё соединение из пула и выполняется параллельно.
+    # Четыре соединения на запрос: под нагрузкой на пул эндпоинт отбрасывается как низкоприоритетный
+    async def section(name, load, *args):
+        started = time.perf_counter()
+        async with open_read_session(use_replica) as session:
+            result = await load(session, user.id, *args)
+        timings[name] = (time.perf_counter() - started) * 1000
+        return result
+
+    started = time.perf_counter()
+    teams, tasks, meetings, evaluations = await asyncio.gather(
+        section("teams", get_dashboard_teams),
+        section("tasks", get_dashboard_tasks, tasks_limit),
+        section("meetings", get_dashboard_meetings, meetings_limit),
+        section("evaluations", get_dashboard_evaluations, period_days),
+    )
+    timings["total"] = (time.perf_counter() - started) * 1000
+
+    summary = DashboardSummary(
+        teams=teams,
+        tasks=tasks,
+        upcoming_meetings=meetings,
+        evaluations=evaluations,
+    )
+    response = json_response(dump_json(DashboardSummary, summary))
+    response.headers["Server-Timing"] = ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
+    return response
@@ -7,7 +7,11 @@ from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import current_active_user
+from app.core.cache import response_cache, make_cache_key
 from app.core.database import get_async_session
+from app.core.invalidation import publish_change, commit_changes
+from app.core.replica import get_read_session, read_started_at
+from app.core.serialization import dump_json, json_response, render_response
 from app.core.templates import templates
 from app.models.evaluation import Evaluation as EvaluationModel
 from app.models.task import Task
@@ -19,6 +23,7 @@ from app.schemas.evaluation import (
     EvaluationStats,
     EvaluationCreateRequest
 )
+from app.utils.archive import evaluations_with_archived, get_task_title
 
 router = APIRouter(prefix="/evaluations", tags=["evaluations"])
 
@@ -27,17 +32,37 @@ router = APIRouter(prefix="/evaluations", tags=["evaluations"])
 async def get_evaluations_api(
         skip: int = Query(0, ge=0),
         limit: int = Query(50, ge=1, le=100),
-        session: AsyncSession = Depends(get_async_session),
+        include_archived: bool = Query(False, description="Включать оценки архивных задач"),
+        session: AsyncSession = Depends(get_read_session),
         current_user: User = Depends(current_active_user)
 ):
-    query = select(EvaluationModel).order_by(desc(EvaluationModel.created_at)).offset(skip).limit(limit)
-    result = await session.execute(query)
-    evaluations = result.scalars().all()
+    cache_key = make_cache_key(
+        "evaluations:list", current_user.id, skip=skip, limit=limit, include_archived=include_archived
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+
+    read_started = read_started_at(session)
+    if include_archived:
+        rows = evaluations_with_archived()
+        query = select(rows).order_by(desc(rows.c.created_at)).offset(skip).limit(limit)
+        result = await session.execute(query)
+        evaluations = result.all()
+    else:
+        query = select(EvaluationModel).order_by(desc(EvaluationModel.created_at)).offset(skip).limit(limit)
+        result = await session.execute(query)
+        evaluations = result.scalars().all()
 
     evaluations_with_details = []
+    cache_tags = {"evaluations"}
     for evaluation in evaluations:
-        task_result = await session.execute(select(Task.title).where(Task.id == evaluation.task_id))
-        task_title = task_result.scalar() or "Неизвестная задача"
+        cache_tags.update((
+            f"task:{evaluation.task_id}",
+            f"user:{evaluation.user_id}",
+            f"user:{evaluation.evaluator_id}"
+        ))
+        task_title = await get_task_title(session, evaluation.task_id, include_archived) or "Неизвестная задача"
 
         user_result = await session.execute(
             select(User.first_name, User.last_name).where(User.id == evaluation.user_id)
@@ -65,7 +90,9 @@ async def get_evaluations_api(
         )
         evaluations_with_details.append(eval_with_details)
 
-    return evaluations_with_details
+    body = dump_json(List[EvaluationWithDetails], evaluations_with_details)
+    await response_cache.set(cache_key, body, cache_tags, started_at=read_started)
+    return json_response(body)
 
 
 @router.get("/", response_model=List[EvaluationWithDetails])
@@ -75,7 +102,7 @@ async def get_evaluations(
         task_id: Optional[int] = None,
         user_id: Optional[int] = None,
         evaluator_id: Optional[int] = None,
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
 ):
     query = select(Evaluation)
 
@@ -111,13 +138,13 @@ async def get_evaluations(
 
         evaluations_with_details.append(EvaluationWithDetails(**eval_dict))
 
-    return evaluations_with_details
+    return render_response(List[EvaluationWithDetails], evaluations_with_details)
 
 
 @router.get("/{evaluation_id}", response_model=EvaluationWithDetails)
 async def get_evaluation(
         evaluation_id: int,
-        session: AsyncSession = Depends(get_async_session)
+        session: AsyncSession = Depends(get_read_session)
 ):
     result = await session.execute(
         select(EvaluationModel).where(EvaluationModel.id == evaluation_id)
@@ -175,7 +202,8 @@ async def create_evaluation(
 
     db_evaluation = EvaluationModel(**evaluation_data)
     session.add(db_evaluation)
-    await session.commit()
+    await publish_change(session, "evaluation_changed", "evaluations")
+    await commit_changes(session)
     await session.refresh(db_evaluation)
 
     return db_evaluation
@@ -210,7 +238,8 @@ async def update_evaluation(
         setattr(db_evaluation, field, value)
 
     session.add(db_evaluation)
-    await session.commit()
+    await publish_change(session, "evaluation_changed", "evaluations")
+    await commit_changes(session)
     await session.refresh(db_evaluation)
 
     return db_evaluation
@@ -240,7 +269,8 @@ async def delete_evaluation(
         )
 
     await session.delete(db_evaluation)
-    await session.commit()
+    await publish_change(session, "evaluation_changed", "evaluations")
+    await commit_changes(session)
 
     return None
 
@@ -249,7 +279,7 @@ async def delete_evaluation(
 async def get_user_evaluation_stats(
         user_id: int,
         period_days: int = Query(30, ge=1, le=365),
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         current_user: User = Depends(current_active_user)
 ):
     if user_id != current_user.id and not current_user.is_superuser:
@@ -288,7 +318,7 @@ async def get_user_evaluations(
         user_id: int,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=1000),
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         current_user: User = Depends(current_active_user)
 ):
     if user_id != current_user.id and not current_user.is_superuser:
@@ -311,7 +341,7 @@ async def get_task_evaluations(
         task_id: int,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=1000),
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         current_user: User = Depends(current_active_user)
 ):
     return await get_evaluations(
@@ -0,0 +1,103 @@
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
+
+from app.core import database
+from app.core.auth import authenticate_token
+from app.core.pubsub import event_broker, encode_event, Subscription
+from app.models.user import User
+from app.utils.teams import get_user_team_ids
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+KEEPALIVE_SECONDS = 15
+
+
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    return None
+
+
+async def _user_topics(user: User) -> List[str]:
+    async with database.async_session_maker() as session:
+        team_ids = await get_user_team_ids(session, user.id)
+    return [f"user:{user.id}"] + [f"team:{team_id}" for team_id in team_ids]
+
+
+async def _refresh_topics_if_needed(subscription: Subscription, user: User, event: dict) -> None:
+    if event["type"] == "membership.changed" and event.get("user_id") == user.id:
+        event_broker.update_topics(subscription, await _user_topics(user))
+
+
+@router.get("/stream")
+async def stream_events(
+        request: Request,
+        token: Optional[str] = Query(None, description="JWT для EventSource, который не умеет передавать заголовки"),
+):
+    user = await authenticate_token(token or _bearer_token(request.headers.get("authorization")))
+    if not user:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    subscription = event_broker.subscribe(await _user_topics(user))
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+
+                await _refresh_topics_if_needed(subscription, user, event)
+                yield f"event: {event['type']}\ndata: {encode_event(event)}\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, token: Optional[str] = Query(None)):
+    user = await authenticate_token(token or _bearer_token(websocket.headers.get("authorization")))
+    if not user:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    subscription = event_broker.subscribe(await _user_topics(user))
+    receiver = asyncio.create_task(websocket.receive_text())
+
+    try:
+        while True:
+            sender = asyncio.create_task(subscription.get(timeout=KEEPALIVE_SECONDS))
+            done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+
+            if receiver in done:
+                receiver.result()
+                receiver = asyncio.create_task(websocket.receive_text())
+
+            if sender not in done:
+                sender.cancel()
+                continue
+
+            event = sender.result()
+            if event is None:
+                await websocket.send_text(encode_event({"type": "keepalive"}))
+                continue
+
+            await _refresh_topics_if_needed(subscription, user, event)
+            await websocket.send_text(encode_event(event))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        event_broker.unsubscribe(subscription)
@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core import database
+from app.core.health import database_probe, replica_probe, pool_status
+from app.core.metrics import event_loop_lag_seconds
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def liveness():
+    return {
+        "status": "OK",
+        "event_loop_lag_ms": round(event_loop_lag_seconds.value() * 1000, 2),
+    }
+
+
+@router.get("/ready")
+async def readiness():
+    db_status = await database_probe.check()
+    ready = db_status["status"] == "ok"
+    content = {
+        "status": "OK" if ready else "Error",
+        "database": db_status,
+        "pool": pool_status(database.async_engine),
+    }
+    # Недоступная реплика не делает сервис неготовым: чтения уходят на primary
+    if database.replica_engine is not None:
+        content["replica"] = await replica_probe.check()
+        content["replica_pool"] = pool_status(database.replica_engine)
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+
+@router.get("")
+async def health_check():
+    return await readiness()
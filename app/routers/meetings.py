@@ -2,24 +2,49 @@ from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, or_, and_
+from sqlalchemy import func, select, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from starlette.requests import Request
-from starlette.responses import HTMLResponse
+from starlette.responses import HTMLResponse, Response
 
+from app.core.activity import activity_log
 from app.core.auth import current_active_user
+from app.core.cache import response_cache, make_cache_key
 from app.core.database import get_async_session
+from app.core.etag import (
+    make_etag,
+    etag_matches,
+    set_etag_headers,
+    not_modified_response,
+    if_match_satisfied,
+    set_version_header,
+)
+from app.core.invalidation import publish_change, commit_changes
+from app.core.pubsub import publish_event
+from app.core.replica import get_read_session, read_started_at, read_target
+from app.core.singleflight import single_flight
+from app.core.serialization import dump_json, json_response, render_response
 from app.core.templates import templates
 from app.models.meeting import Meeting, MeetingParticipant
 from app.models.user import User
 from app.schemas.meeting import MeetingCreate, MeetingRead, MeetingUpdate
-from app.utils.meetings import get_meeting_by_id, is_meeting_organizer, is_meeting_participant
+from app.utils.meetings import get_meeting_by_id, is_meeting_organizer, get_meeting_version
 from app.utils.teams import get_user_team_role
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
 
+def meeting_event_data(meeting: Meeting) -> dict:
+    return {
+        "meeting_id": meeting.id,
+        "team_id": meeting.team_id,
+        "title": meeting.title,
+        "start_time": meeting.start_time,
+        "end_time": meeting.end_time,
+    }
+
+
 @router.get("", response_class=HTMLResponse)
 async def meetings_page(
         request: Request,
@@ -40,7 +65,7 @@ async def meetings_page(
 async def get_meetings_list(
         filter: str = Query("all", description="Фильтр по времени"),
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     try:
         from sqlalchemy import distinct
@@ -72,7 +97,7 @@ async def get_meetings_list(
 
         result = await db.execute(query)
         meetings = result.scalars().all()
-        return meetings
+        return render_response(List[MeetingRead], meetings)
     except Exception as e:
         print(f"Error in get_meetings_list: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -130,7 +155,13 @@ async def create_meeting(
     )
     db.add(organizer_participant)
 
-    await db.commit()
+    await publish_change(db, "meeting_changed", f"team:{meeting.team_id}")
+    await commit_changes(db)
+    await publish_event(db, "meeting.created", [f"team:{meeting.team_id}"], **meeting_event_data(meeting))
+    activity_log.record(
+        meeting.team_id, user.id, "meeting.created", meeting.id,
+        {"title": meeting.title, "start_time": meeting.start_time, "end_time": meeting.end_time},
+    )
 
     result = await db.execute(
         select(Meeting)
@@ -150,6 +181,8 @@ async def create_meeting(
 async def update_meeting(
         meeting_id: int,
         meeting_data: MeetingUpdate,
+        request: Request,
+        response: Response,
         user: User = Depends(current_active_user),
         db: AsyncSession = Depends(get_async_session)
 ):
@@ -159,6 +192,8 @@ async def update_meeting(
     meeting = await get_meeting_by_id(db, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
+    if not if_match_satisfied(request, meeting.version):
+        raise HTTPException(status_code=412, detail="Meeting was modified, reload it and retry")
 
     if meeting_data.title is not None:
         meeting.title = meeting_data.title
@@ -213,8 +248,18 @@ async def update_meeting(
             )
             db.add(participant)
 
-    meeting.updated_at = datetime.utcnow()
-    await db.commit()
+        # Состав участников — часть встречи: строка meetings должна обновиться и сменить версию
+        meeting.updated_at = func.now()
+
+    await publish_change(db, "meeting_changed", f"meeting:{meeting_id}", f"team:{meeting.team_id}")
+    await commit_changes(db)
+    rescheduled = meeting_data.start_time is not None or meeting_data.end_time is not None
+    await publish_event(
+        db,
+        "meeting.rescheduled" if rescheduled else "meeting.updated",
+        [f"team:{meeting.team_id}"],
+        **meeting_event_data(meeting)
+    )
 
     result = await db.execute(
         select(Meeting)
@@ -226,6 +271,9 @@ async def update_meeting(
         .where(Meeting.id == meeting_id)
     )
     updated_meeting = result.scalar_one()
+    version = await get_meeting_version(db, meeting_id, user.id)
+    response.headers["ETag"] = make_etag("meeting", meeting_id, *version)
+    set_version_header(response, updated_meeting.version)
 
     return updated_meeting
 
@@ -294,9 +342,22 @@ async def check_meeting_time_conflicts(
 @router.get("/{meeting_id}", response_model=MeetingRead)
 async def get_meeting(
         meeting_id: int,
+        request: Request,
+        response: Response,
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
+    version = await get_meeting_version(db, meeting_id, user.id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    if not version.is_participant and not version.is_member:
+        raise HTTPException(status_code=403, detail="You don't have access to this meeting")
+
+    etag = make_etag("meeting", meeting_id, *version)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
     result = await db.execute(
         select(Meeting)
         .options(
@@ -311,12 +372,8 @@ async def get_meeting(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
-    is_participant = await is_meeting_participant(db, user.id, meeting_id)
-    user_role = await get_user_team_role(db, user.id, meeting.team_id)
-
-    if not is_participant and not user_role:
-        raise HTTPException(status_code=403, detail="You don't have access to this meeting")
-
+    set_etag_headers(response, etag)
+    set_version_header(response, meeting.version)
     return meeting
 
 
@@ -349,13 +406,12 @@ async def delete_meeting(
             detail="Only meeting organizer or team admin can delete meeting"
         )
 
-    await db.execute(
-        MeetingParticipant.__table__.delete()
-        .where(MeetingParticipant.meeting_id == meeting_id)
-    )
-
     await db.delete(meeting)
-    await db.commit()
+    await publish_change(db, "meeting_changed", f"meeting:{meeting_id}")
+    await commit_changes(db)
+    await publish_event(
+        db, "meeting.deleted", [f"team:{meeting.team_id}"], meeting_id=meeting_id, team_id=meeting.team_id
+    )
 
     return {"message": "Meeting deleted successfully"}
 
@@ -364,31 +420,48 @@ async def delete_meeting(
 async def get_team_meetings(
         team_id: int,
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     user_role = await get_user_team_role(db, user.id, team_id)
     if not user_role:
         raise HTTPException(status_code=403, detail="You are not a member of this team")
 
-    result = await db.execute(
-        select(Meeting)
-        .options(
-            selectinload(Meeting.organizer),
-            selectinload(Meeting.team),
-            selectinload(Meeting.participants).selectinload(MeetingParticipant.user)
+    cache_key = make_cache_key("meetings:team", user.id, team_id=team_id)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+
+    async def fetch():
+        read_started = read_started_at(db)
+        result = await db.execute(
+            select(Meeting)
+            .options(
+                selectinload(Meeting.organizer),
+                selectinload(Meeting.team),
+                selectinload(Meeting.participants).selectinload(MeetingParticipant.user)
+            )
+            .filter(Meeting.team_id == team_id)
+            .order_by(Meeting.start_time)
         )
-        .filter(Meeting.team_id == team_id)
-        .order_by(Meeting.start_time)
-    )
-    meetings = result.scalars().all()
+        meetings = result.scalars().all()
+
+        cache_tags = {f"team:{team_id}"}
+        for meeting in meetings:
+            cache_tags.update((f"meeting:{meeting.id}", f"user:{meeting.organizer_id}"))
+            cache_tags.update(f"user:{participant.user_id}" for participant in meeting.participants)
 
-    return meetings
+        return dump_json(List[MeetingRead], meetings), cache_tags, read_started
+
+    # Ответ одинаков для всех участников команды, членство уже проверено выше
+    body, cache_tags, read_started = await single_flight.do(f"meetings:team:{team_id}:{read_target(db)}", fetch)
+    await response_cache.set(cache_key, body, cache_tags, started_at=read_started)
+    return json_response(body)
 
 
 @router.get("/user/upcoming", response_model=List[MeetingRead])
 async def get_upcoming_meetings(
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     result = await db.execute(
         select(Meeting)
@@ -406,4 +479,4 @@ async def get_upcoming_meetings(
     )
     meetings = result.scalars().all()
 
-    return meetings
+    return render_response(List[MeetingRead], meetings)
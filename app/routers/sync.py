@@ -0,0 +1,68 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import current_active_user
+from app.core.config import settings
+from app.core.replica import get_read_session
+from app.core.serialization import dump_json, json_response
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.utils.sync import (
+    SyncToken,
+    database_now,
+    get_sync_changes,
+    sync_horizon,
+    sync_token_expired,
+)
+from app.utils.teams import get_user_team_ids, get_user_team_role
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+        since: Optional[str] = Query(None, description="next_token из предыдущего ответа; без него — полная выгрузка"),
+        team_id: Optional[int] = Query(
+            None, description="Только одна команда, например для догрузки команды, в которую пользователь вступил"
+        ),
+        limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=1000, description="Сколько строк каждой сущности на странице"),
+        user: User = Depends(current_active_user),
+        db: AsyncSession = Depends(get_read_session)
+):
+    token = None
+    if since:
+        try:
+            token = SyncToken.decode(since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if token.team_id != team_id:
+            raise HTTPException(status_code=400, detail="Sync token was issued for a different team scope")
+
+    if team_id is not None:
+        if not await get_user_team_role(db, user.id, team_id):
+            raise HTTPException(status_code=403, detail="You are not a member of this team")
+        team_ids = [team_id]
+    else:
+        team_ids = await get_user_team_ids(db, user.id)
+
+    now = await database_now(db)
+    if token is None:
+        # При полной выгрузке удалять на клиенте нечего: следы начинаются с горизонта
+        horizon = sync_horizon(db, now)
+        token = SyncToken({"deleted": (horizon, 0)}, team_id=team_id)
+    elif sync_token_expired(token, now):
+        raise HTTPException(status_code=410, detail="Sync token expired, full resync required")
+
+    changes, next_token, has_more = await get_sync_changes(
+        db,
+        user.id,
+        team_ids,
+        token,
+        token.horizon or sync_horizon(db, now),
+        limit,
+        own_tombstones=team_id is None,
+    )
+    response = {**changes, "next_token": next_token.encode(), "has_more": has_more}
+    return json_response(dump_json(SyncResponse, response))
@@ -1,30 +1,64 @@
-from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.requests import Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.activity import activity_changes, activity_log
 from app.core.auth import current_active_user
+from app.core.cache import response_cache, make_cache_key
 from app.core.database import get_async_session
+from app.core.etag import (
+    make_etag,
+    etag_matches,
+    set_etag_headers,
+    not_modified_response,
+    if_match_satisfied,
+    set_version_header,
+)
+from app.core.invalidation import publish_change, commit_changes
+from app.core.pubsub import publish_event
+from app.core.replica import get_read_session, read_started_at
+from app.core.serialization import dump_json, json_response, render_response
 from app.core.templates import templates
 from app.models.task import Task, TaskComment
 from app.models.team import UserTeam, Team
 from app.models.user import User
 from app.schemas.task import PaginatedResponse, TaskCreate, TaskRead, TaskUpdate, TaskCommentCreate, TaskCommentRead
-from app.utils.tasks import get_task_by_id, get_task_comments
+from app.utils.archive import get_archived_task, get_archived_task_comments, get_tasks_page_with_archived
+from app.utils.tasks import get_task_by_id, get_task_comments, get_task_version
 from app.utils.teams import is_team_manager_or_admin, get_user_team_role
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
+def task_event_data(task: Task) -> dict:
+    return {
+        "task_id": task.id,
+        "team_id": task.team_id,
+        "title": task.title,
+        "status": task.status,
+        "deadline": task.deadline,
+        "assignee_id": task.assignee_id,
+    }
+
+
+def task_activity_fields(task: Task) -> dict:
+    return {
+        "title": task.title,
+        "status": task.status,
+        "deadline": task.deadline,
+        "assignee_id": task.assignee_id,
+    }
+
+
 @router.get("/my-team-tasks", response_model=List[TaskRead])
 async def get_my_team_tasks(
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     from app.models.team import UserTeam, Team
     from fastapi import HTTPException
@@ -51,7 +85,7 @@ async def get_my_team_tasks(
         result = await db.execute(query)
         tasks = result.scalars().all()
 
-        return tasks
+        return render_response(List[TaskRead], tasks)
     except Exception as e:
         print(f"Error in get_my_team_tasks: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -79,32 +113,40 @@ async def get_tasks_list(
         per_page: int = Query(10, ge=1, le=100, description="Элементов на странице"),
         filter: str = Query("all", description="Фильтр по статусу"),
         sort: str = Query("newest", description="Сортировка"),
+        include_archived: bool = Query(False, description="Включать задачи из архива"),
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
+    cache_key = make_cache_key(
+        "tasks:list", user.id,
+        page=page, per_page=per_page, filter=filter, sort=sort, include_archived=include_archived
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+
     try:
+        read_started = read_started_at(db)
         offset = (page - 1) * per_page
 
         from sqlalchemy.orm import selectinload, joinedload
 
+        if include_archived:
+            tasks, total_count = await get_tasks_page_with_archived(
+                db,
+                lambda model: _task_list_criteria(model, user.id, filter),
+                lambda columns: _task_list_order(columns, sort),
+                offset,
+                per_page,
+            )
+            return await _cache_tasks_page(cache_key, read_started, user, tasks, total_count, page, per_page)
+
         query = select(Task).options(
             selectinload(Task.creator),
             selectinload(Task.assignee),
             selectinload(Task.team).selectinload(Team.members).selectinload(UserTeam.user),
             selectinload(Task.comments).selectinload(TaskComment.author)
-        ).filter(Task.assignee_id == user.id)
-
-        if filter != "all":
-            query = query.filter(Task.status == filter)
-
-        if sort == "newest":
-            query = query.order_by(Task.created_at.desc())
-        elif sort == "oldest":
-            query = query.order_by(Task.created_at.asc())
-        elif sort == "deadline":
-            query = query.order_by(Task.deadline.asc())
-        elif sort == "priority":
-            query = query.order_by(Task.created_at.desc())
+        ).filter(*_task_list_criteria(Task, user.id, filter)).order_by(*_task_list_order(Task, sort))
 
         result = await db.execute(
             query
@@ -113,27 +155,58 @@ async def get_tasks_list(
         )
         tasks = result.scalars().all()
 
-        count_query = select(func.count(Task.id)).filter(Task.assignee_id == user.id)
-        if filter != "all":
-            count_query = count_query.filter(Task.status == filter)
+        count_query = select(func.count(Task.id)).filter(*_task_list_criteria(Task, user.id, filter))
 
         count_result = await db.execute(count_query)
         total_count = count_result.scalar()
 
         print(f"Tasks found: {len(tasks)}, Total count: {total_count}")
 
-        return PaginatedResponse[TaskRead](
-            items=tasks,
-            page=page,
-            per_page=per_page,
-            total_count=total_count,
-            total_pages=(total_count + per_page - 1) // per_page if total_count > 0 else 0
-        )
+        return await _cache_tasks_page(cache_key, read_started, user, tasks, total_count, page, per_page)
     except Exception as e:
         print(f"Error in get_tasks_list: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+def _task_list_criteria(model, user_id: int, filter: str):
+    criteria = [model.assignee_id == user_id]
+    if filter != "all":
+        criteria.append(model.status == filter)
+    return criteria
+
+
+def _task_list_order(columns, sort: str):
+    if sort == "newest":
+        return [columns.created_at.desc()]
+    if sort == "oldest":
+        return [columns.created_at.asc()]
+    if sort == "deadline":
+        return [columns.deadline.asc()]
+    if sort == "priority":
+        return [columns.created_at.desc()]
+    return []
+
+
+async def _cache_tasks_page(cache_key, read_started, user: User, tasks, total_count: int, page: int, per_page: int):
+    paginated = PaginatedResponse[TaskRead](
+        items=tasks,
+        page=page,
+        per_page=per_page,
+        total_count=total_count,
+        total_pages=(total_count + per_page - 1) // per_page if total_count > 0 else 0
+    )
+
+    cache_tags = {f"user:{user.id}"}
+    for task in tasks:
+        cache_tags.update((f"task:{task.id}", f"team:{task.team_id}"))
+        cache_tags.update(f"user:{user_id}" for user_id in (task.creator_id, task.assignee_id) if user_id)
+        cache_tags.update(f"user:{comment.author_id}" for comment in task.comments)
+
+    body = dump_json(PaginatedResponse[TaskRead], paginated)
+    await response_cache.set(cache_key, body, cache_tags, started_at=read_started)
+    return json_response(body)
+
+
 from sqlalchemy.orm import selectinload
 
 
@@ -163,7 +236,13 @@ async def create_task(
     )
 
     db.add(task)
-    await db.commit()
+    await publish_change(db, "task_changed", f"team:{task.team_id}", f"user:{task.assignee_id}")
+    await commit_changes(db)
+    await publish_event(db, "task.created", [f"team:{task.team_id}"], **task_event_data(task))
+    activity_log.record(
+        task.team_id, user.id, "task.created", task.id,
+        {"title": task.title, "status": task.status, "assignee_id": task.assignee_id},
+    )
 
     result = await db.execute(
         select(Task)
@@ -183,9 +262,25 @@ async def create_task(
 @router.get("/{task_id}", response_model=TaskRead)
 async def get_task(
         task_id: int,
+        request: Request,
+        response: Response,
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        include_archived: bool = Query(False, description="Искать задачу в архиве"),
+        db: AsyncSession = Depends(get_read_session)
 ):
+    version = await get_task_version(db, task_id, user.id)
+    if not version and include_archived:
+        return await _get_archived_task(db, task_id, user)
+    if not version:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if not version.is_member:
+        raise HTTPException(status_code=403, detail="You are not a member of this task's team")
+
+    etag = make_etag("task", task_id, *version)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
     result = await db.execute(
         select(Task)
         .options(
@@ -198,6 +293,16 @@ async def get_task(
     )
     task = result.scalar_one_or_none()
 
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    set_etag_headers(response, etag)
+    set_version_header(response, task.version)
+    return task
+
+
+async def _get_archived_task(db: AsyncSession, task_id: int, user: User):
+    task = await get_archived_task(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -212,6 +317,8 @@ async def get_task(
 async def update_task(
         task_id: int,
         task_data: TaskUpdate,
+        request: Request,
+        response: Response,
         user: User = Depends(current_active_user),
         db: AsyncSession = Depends(get_async_session)
 ):
@@ -222,7 +329,10 @@ async def update_task(
     user_role = await get_user_team_role(db, user.id, task.team_id)
     if user.id != task.assignee_id and not await is_team_manager_or_admin(db, user.id, task.team_id):
         raise HTTPException(status_code=403, detail="You can only update your own tasks")
+    if not if_match_satisfied(request, task.version):
+        raise HTTPException(status_code=412, detail="Task was modified, reload it and retry")
 
+    before = task_activity_fields(task)
     if task_data.title is not None:
         task.title = task_data.title
     if task_data.description is not None:
@@ -238,8 +348,12 @@ async def update_task(
             raise HTTPException(status_code=400, detail="Assignee must be a team member")
         task.assignee_id = task_data.assignee_id
 
-    task.updated_at = datetime.utcnow()
-    await db.commit()
+    await publish_change(db, "task_changed", f"task:{task_id}", f"user:{task.assignee_id}")
+    await commit_changes(db)
+    await publish_event(db, "task.updated", [f"team:{task.team_id}"], **task_event_data(task))
+    activity_log.record(
+        task.team_id, user.id, "task.updated", task_id, activity_changes(before, task_activity_fields(task))
+    )
 
     result = await db.execute(
         select(Task)
@@ -252,6 +366,9 @@ async def update_task(
         .where(Task.id == task_id)
     )
     task = result.scalar_one()
+    version = await get_task_version(db, task_id, user.id)
+    response.headers["ETag"] = make_etag("task", task_id, *version)
+    set_version_header(response, task.version)
 
     return task
 
@@ -271,7 +388,9 @@ async def delete_task(
         raise HTTPException(status_code=403, detail="You can only delete your own tasks")
 
     await db.delete(task)
-    await db.commit()
+    await publish_change(db, "task_changed", f"task:{task_id}")
+    await commit_changes(db)
+    await publish_event(db, "task.deleted", [f"team:{task.team_id}"], task_id=task_id, team_id=task.team_id)
 
     return {"message": "Task deleted successfully"}
 
@@ -297,7 +416,18 @@ async def add_comment(
         author_id=user.id
     )
     db.add(comment)
-    await db.commit()
+    await publish_change(db, "task_changed", f"task:{task_id}")
+    await commit_changes(db)
+    await publish_event(
+        db,
+        "comment.added",
+        [f"team:{task.team_id}"],
+        task_id=task_id,
+        team_id=task.team_id,
+        comment_id=comment.id,
+        author_id=user.id
+    )
+    activity_log.record(task.team_id, user.id, "comment.added", task_id, {"comment_id": comment.id})
     await db.refresh(comment)
 
     result = await db.execute(
@@ -318,10 +448,22 @@ async def add_comment(
 @router.get("/{task_id}/comments", response_model=List[TaskCommentRead])
 async def get_comments(
         task_id: int,
+        include_archived: bool = Query(False, description="Искать задачу в архиве"),
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     task = await get_task_by_id(db, task_id)
+    if not task and include_archived:
+        task = await _get_archived_task(db, task_id, user)
+        return [
+            TaskCommentRead(
+                id=comment.ArchivedTaskComment.id,
+                content=comment.ArchivedTaskComment.content,
+                author=comment.User,
+                created_at=comment.ArchivedTaskComment.created_at
+            )
+            for comment in await get_archived_task_comments(db, task.id)
+        ]
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -1,16 +1,35 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.requests import Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.activity import activity_log
 from app.core.auth import current_active_user
+from app.core.cache import response_cache, make_cache_key
+from app.core.config import settings
 from app.core.database import get_async_session
+from app.core.etag import (
+    make_etag,
+    etag_matches,
+    set_etag_headers,
+    not_modified_response,
+    if_match_satisfied,
+    set_version_header,
+)
+from app.core.invalidation import publish_change, commit_changes
+from app.core.pubsub import publish_event
+from app.core.replica import get_read_session, read_started_at, read_target
+from app.core.singleflight import single_flight
+from app.core.serialization import dump_json, json_response
 from app.core.templates import templates
+from app.models.activity import TeamActivity
 from app.models.team import Team, UserTeam
 from app.models.user import User
+from app.schemas.activity import ActivityPage
 from app.schemas.team import (
     TeamCreate,
     TeamRead,
@@ -20,12 +39,17 @@ from app.schemas.team import (
     TeamMember,
 )
 from app.schemas.user import UserRead
+from app.utils.activity import get_team_activity_page
 from app.utils.teams import (
     generate_invite_code,
     get_team_by_id,
     is_team_admin,
     is_team_manager_or_admin,
     get_user_team_role,
+    get_team_version,
+    count_team_rows,
+    start_team_deletion,
+    schedule_team_deletion,
 )
 
 router = APIRouter(prefix="/teams", tags=["teams"])
@@ -34,8 +58,14 @@ router = APIRouter(prefix="/teams", tags=["teams"])
 @router.get("/list", response_model=List[TeamRead])
 async def get_user_teams(
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
+    cache_key = make_cache_key("teams:list", user.id)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached)
+
+    read_started = read_started_at(db)
     result = await db.execute(
         select(Team)
         .join(UserTeam)
@@ -43,6 +73,7 @@ async def get_user_teams(
     )
     teams = result.scalars().all()
     teams_with_members = []
+    cache_tags = {f"user:{user.id}"}
     for team in teams:
         members_result = await db.execute(
             select(UserTeam, User)
@@ -67,11 +98,16 @@ async def get_user_teams(
             "invite_code": team.invite_code,
             "created_at": team.created_at,
             "updated_at": team.updated_at,
+            "version": team.version,
             "members": members
         }
         teams_with_members.append(team_dict)
+        cache_tags.add(f"team:{team.id}")
+        cache_tags.update(f"user:{member.User.id}" for member in members_data)
 
-    return teams_with_members
+    body = dump_json(List[TeamRead], teams_with_members)
+    await response_cache.set(cache_key, body, cache_tags, started_at=read_started)
+    return json_response(body)
 
 
 @router.get("", response_class=HTMLResponse)
@@ -99,7 +135,17 @@ async def create_team(
     )
     db.add(user_team)
 
-    await db.commit()
+    await publish_change(db, "membership_changed", f"user:{user.id}")
+    await commit_changes(db)
+    await publish_event(
+        db,
+        "membership.changed",
+        [f"user:{user.id}"],
+        team_id=team.id,
+        user_id=user.id,
+        action="created"
+    )
+    activity_log.record(team.id, user.id, "team.created", team.id, {"name": team.name})
     await db.refresh(team)
     from sqlalchemy.orm import selectinload
     result = await db.execute(
@@ -115,6 +161,7 @@ async def create_team(
         "invite_code": team.invite_code,
         "created_at": team.created_at,
         "updated_at": team.updated_at,
+        "version": team.version,
         "members": [
             {
                 "user": {
@@ -136,51 +183,72 @@ async def create_team(
 @router.get("/{team_id}", response_model=TeamRead)
 async def get_team(
         team_id: int,
+        request: Request,
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
-    from sqlalchemy.orm import selectinload
-    result = await db.execute(
-        select(Team)
-        .options(selectinload(Team.members).selectinload(UserTeam.user))
-        .where(Team.id == team_id)
-    )
-    team = result.scalar_one_or_none()
-
-    if not team:
+    version = await get_team_version(db, team_id, user.id)
+    if not version:
         raise HTTPException(status_code=404, detail="Team not found")
-    user_role = await get_user_team_role(db, user.id, team_id)
-    if not user_role:
+    if not version.is_member:
         raise HTTPException(status_code=403, detail="Not a member of this team")
-    team_dict = {
-        "id": team.id,
-        "name": team.name,
-        "description": team.description,
-        "invite_code": team.invite_code,
-        "created_at": team.created_at,
-        "updated_at": team.updated_at,
-        "members": [
-            {
-                "user": {
-                    "id": member.user.id,
-                    "email": member.user.email,
-                    "first_name": member.user.first_name,
-                    "last_name": member.user.last_name
-                },
-                "role": member.role,
-                "joined_at": member.created_at
-            }
-            for member in team.members
-        ]
-    }
 
-    return team_dict
+    etag = make_etag("team", team_id, *version)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    async def fetch():
+        from sqlalchemy.orm import selectinload
+        result = await db.execute(
+            select(Team)
+            .options(selectinload(Team.members).selectinload(UserTeam.user))
+            .where(Team.id == team_id)
+        )
+        team = result.scalar_one_or_none()
+
+        if not team:
+            return None
+        team_dict = {
+            "id": team.id,
+            "name": team.name,
+            "description": team.description,
+            "invite_code": team.invite_code,
+            "created_at": team.created_at,
+            "updated_at": team.updated_at,
+            "version": team.version,
+            "members": [
+                {
+                    "user": {
+                        "id": member.user.id,
+                        "email": member.user.email,
+                        "first_name": member.user.first_name,
+                        "last_name": member.user.last_name
+                    },
+                    "role": member.role,
+                    "joined_at": member.created_at
+                }
+                for member in team.members
+            ]
+        }
+        return dump_json(TeamRead, team_dict)
+
+    # ETag описывает версию команды, поэтому одновременные запросы одной версии делят один запрос к БД
+    body = await single_flight.do(f"team:{team_id}:{etag}:{read_target(db)}", fetch)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    response = json_response(body)
+    set_etag_headers(response, etag)
+    set_version_header(response, version.version)
+    return response
 
 
 @router.put("/{team_id}", response_model=TeamRead)
 async def update_team(
         team_id: int,
         team_data: TeamUpdate,
+        request: Request,
+        response: Response,
         user: User = Depends(current_active_user),
         db: AsyncSession = Depends(get_async_session)
 ):
@@ -190,13 +258,19 @@ async def update_team(
     team = await get_team_by_id(db, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
+    if not if_match_satisfied(request, team.version):
+        raise HTTPException(status_code=412, detail="Team was modified, reload it and retry")
     if team_data.name is not None:
         team.name = team_data.name
     if team_data.description is not None:
         team.description = team_data.description
 
-    await db.commit()
+    await publish_change(db, "team_changed", f"team:{team_id}")
+    await commit_changes(db)
     await db.refresh(team)
+    version = await get_team_version(db, team_id, user.id)
+    response.headers["ETag"] = make_etag("team", team_id, *version)
+    set_version_header(response, team.version)
 
     return team
 
@@ -214,9 +288,22 @@ async def delete_team(
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
 
-    await db.delete(team)
-    await db.commit()
-
+    chunk_size = settings.TEAM_DELETE_CHUNK_SIZE
+    background = await count_team_rows(db, team_id, chunk_size) >= chunk_size
+    if background:
+        # Без участников команда сразу пропадает у всех, а задачи и встречи удаляются пачками в фоне
+        await start_team_deletion(db, team_id)
+    else:
+        await db.execute(delete(TeamActivity).where(TeamActivity.team_id == team_id))
+        await db.execute(delete(Team).where(Team.id == team_id))
+    await publish_change(db, "team_changed", f"team:{team_id}")
+    await commit_changes(db)
+
+    await publish_event(db, "team.deleted", [f"team:{team_id}"], team_id=team_id)
+
+    if background:
+        schedule_team_deletion(team_id)
+        return JSONResponse(status_code=202, content={"message": "Team deletion started"})
     return {"message": "Team deleted successfully"}
 
 
@@ -224,7 +311,7 @@ async def delete_team(
 async def get_team_members(
         team_id: int,
         user: User = Depends(current_active_user),
-        db: AsyncSession = Depends(get_async_session)
+        db: AsyncSession = Depends(get_read_session)
 ):
     user_team = await db.execute(
         select(UserTeam)
@@ -264,7 +351,17 @@ async def invite_user(
         role=invite_data.role
     )
     db.add(user_team)
-    await db.commit()
+    await publish_change(db, "membership_changed", f"team:{team_id}", f"user:{invited_user.id}")
+    await commit_changes(db)
+    await publish_event(
+        db,
+        "membership.changed",
+        [f"team:{team_id}", f"user:{invited_user.id}"],
+        team_id=team_id,
+        user_id=invited_user.id,
+        action="invited"
+    )
+    activity_log.record(team_id, user.id, "member.invited", invited_user.id, {"role": invite_data.role})
 
     return {"message": f"User {invited_user.email} added to team as {invite_data.role}"}
 
@@ -275,7 +372,9 @@ async def join_team(
         user: User = Depends(current_active_user),
         db: AsyncSession = Depends(get_async_session)
 ):
-    result = await db.execute(select(Team).filter(Team.invite_code == join_data.invite_code))
+    result = await db.execute(
+        select(Team).filter(Team.invite_code == join_data.invite_code, Team.deleting.is_(False))
+    )
     team = result.scalar_one_or_none()
 
     if not team:
@@ -289,7 +388,17 @@ async def join_team(
         role="member"
     )
     db.add(user_team)
-    await db.commit()
+    await publish_change(db, "membership_changed", f"team:{team.id}", f"user:{user.id}")
+    await commit_changes(db)
+    await publish_event(
+        db,
+        "membership.changed",
+        [f"team:{team.id}", f"user:{user.id}"],
+        team_id=team.id,
+        user_id=user.id,
+        action="joined"
+    )
+    activity_log.record(team.id, user.id, "member.joined", user.id, {"role": user_team.role})
 
     return {"message": f"Joined team {team.name} successfully"}
 
@@ -316,7 +425,17 @@ async def remove_member(
     if not user_team:
         raise HTTPException(status_code=404, detail="User is not a member of this team")
     await db.delete(user_team)
-    await db.commit()
+    await publish_change(db, "membership_changed", f"team:{team_id}", f"user:{user_id}")
+    await commit_changes(db)
+    await publish_event(
+        db,
+        "membership.changed",
+        [f"team:{team_id}", f"user:{user_id}"],
+        team_id=team_id,
+        user_id=user_id,
+        action="removed"
+    )
+    activity_log.record(team_id, user.id, "member.removed", user_id)
 
     return {"message": "User removed from team successfully"}
 
@@ -337,3 +456,18 @@ async def get_invite_code(
         raise HTTPException(status_code=404, detail="Team not found")
 
     return {"invite_code": team.invite_code}
+
+
+@router.get("/{team_id}/activity", response_model=ActivityPage)
+async def get_team_activity(
+        team_id: int,
+        before: Optional[int] = Query(None, description="next_cursor из предыдущей страницы"),
+        limit: int = Query(50, ge=1, le=200),
+        user: User = Depends(current_active_user),
+        db: AsyncSession = Depends(get_read_session)
+):
+    if not await get_user_team_role(db, user.id, team_id):
+        raise HTTPException(status_code=403, detail="You are not a member of this team")
+
+    page = await get_team_activity_page(db, team_id, before, limit)
+    return json_response(dump_json(ActivityPage, page))
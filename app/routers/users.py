@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core.auth import current_active_user
-from app.core.database import get_async_session
+from app.core.replica import get_read_session
 from app.models.user import User
 from app.schemas.user import UserRead
 from app.schemas.user_evalluations import User as UserSchema
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 async def get_users(
         skip: int = 0,
         limit: int = 100,
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         current_user: User = Depends(current_active_user)
 ):
     result = await session.execute(
@@ -33,7 +33,7 @@ async def get_users(
 async def get_users_list(
         skip: int = 0,
         limit: int = 100,
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         current_user: User = Depends(current_active_user)
 ):
     result = await session.execute(
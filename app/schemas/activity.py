@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class ActivityRead(BaseModel):
+    id: int
+    team_id: int
+    actor_id: Optional[int] = None
+    action: str
+    entity_id: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class ActivityPage(BaseModel):
+    items: List[ActivityRead]
+    next_cursor: Optional[int] = None
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.task import TaskStatus
+
+
+class DashboardTeam(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    members_count: int
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class DashboardTask(BaseModel):
+    id: int
+    title: str
+    status: TaskStatus
+    deadline: Optional[datetime] = None
+    team_id: Optional[int] = None
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class DashboardTasks(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    open: List[DashboardTask]
+
+
+class DashboardMeeting(BaseModel):
+    id: int
+    title: str
+    start_time: datetime
+    end_time: datetime
+    team_id: Optional[int] = None
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class DashboardEvaluations(BaseModel):
+    average_rating: float
+    total_evaluations: int
+    period_start: datetime
+    period_end: datetime
+
+
+class DashboardSummary(BaseModel):
+    teams: List[DashboardTeam]
+    tasks: DashboardTasks
+    upcoming_meetings: List[DashboardMeeting]
+    evaluations: DashboardEvaluations
@@ -8,8 +8,8 @@ class EvaluationBase(BaseModel):
     rating: int = Field(..., ge=1, le=5, description="Rating from 1 to 5")
     comment: Optional[str] = None
     task_id: int
-    user_id: int
-    evaluator_id: int
+    user_id: Optional[int]
+    evaluator_id: Optional[int]
 
 
 class EvaluationCreate(BaseModel):
@@ -34,9 +34,10 @@ class MeetingParticipantRead(BaseModel):
 
 class MeetingRead(MeetingBase):
     id: int
-    organizer_id: int
+    organizer_id: Optional[int]
     created_at: datetime
     updated_at: datetime
+    version: int
 
     organizer: Optional[UserRead] = None
     team: Optional[TeamReadMeeting] = None
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.task import TaskStatus
+
+
+class SyncTask(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    deadline: Optional[datetime] = None
+    creator_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    team_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class SyncComment(BaseModel):
+    id: int
+    content: str
+    task_id: Optional[int] = None
+    author_id: Optional[int] = None
+    team_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class SyncMeeting(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    start_time: datetime
+    end_time: datetime
+    organizer_id: Optional[int] = None
+    team_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class SyncMembership(BaseModel):
+    id: int
+    team_id: Optional[int] = None
+    user_id: Optional[int] = None
+    role: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class SyncDeleted(BaseModel):
+    entity: str
+    entity_id: int
+    team_id: Optional[int] = None
+    user_id: Optional[int] = None
+    deleted_at: datetime
+
+    model_config = {
+        'from_attributes': True,
+    }
+
+
+class SyncResponse(BaseModel):
+    tasks: List[SyncTask] = []
+    comments: List[SyncComment] = []
+    meetings: List[SyncMeeting] = []
+    memberships: List[SyncMembership] = []
+    deleted: List[SyncDeleted] = []
+    next_token: str
+    has_more: bool
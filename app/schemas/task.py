@@ -66,7 +66,7 @@ class SimpleTeamRead(BaseModel):
 class TaskCommentRead(BaseModel):
     id: int
     content: str
-    author: UserRead
+    author: Optional[UserRead] = None
     created_at: datetime
 
     model_config = {
@@ -80,11 +80,13 @@ class TaskRead(BaseModel):
     description: Optional[str]
     status: TaskStatus
     deadline: Optional[datetime]
-    creator_id: int
+    creator_id: Optional[int]
     assignee_id: Optional[int]
     team_id: int
     created_at: datetime
     updated_at: datetime
+    # У архивных задач версии нет
+    version: Optional[int] = None
     creator: Optional[UserRead] = None
     assignee: Optional[UserRead] = None
     team: Optional[SimpleTeamRead] = None
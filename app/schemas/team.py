@@ -38,6 +38,7 @@ class TeamRead(BaseModel):
     invite_code: str
     created_at: datetime
     updated_at: datetime
+    version: int
     members: List[TeamMember]
 
     model_config = {
@@ -209,5 +209,10 @@ document.addEventListener('DOMContentLoaded', async () => {
     const isAuthenticated = await checkAuth();
     if (isAuthenticated) {
         await loadCalendarEvents();
+
+        subscribeToEvents(
+            ['task.created', 'task.updated', 'task.deleted', 'meeting.created', 'meeting.rescheduled', 'meeting.deleted'],
+            () => loadCalendarEvents()
+        );
     }
 });
\ No newline at end of file
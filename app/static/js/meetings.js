@@ -365,6 +365,11 @@ document.addEventListener('DOMContentLoaded', async () => {
     await loadUserTeams();
     await loadMeetings();
 
+    subscribeToEvents(
+        ['meeting.created', 'meeting.updated', 'meeting.rescheduled', 'meeting.deleted', 'membership.changed'],
+        () => loadMeetings()
+    );
+
     document.getElementById('create-meeting').addEventListener('submit', async (e) => {
         e.preventDefault();
 
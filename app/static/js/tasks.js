@@ -269,4 +269,9 @@ function setupFormHandler() {
 document.addEventListener('DOMContentLoaded', async () => {
     await loadTasks(currentPage, perPage);
     setupFormHandler();
+
+    subscribeToEvents(
+        ['task.created', 'task.updated', 'task.deleted', 'comment.added'],
+        () => loadTasks(currentPage, perPage)
+    );
 });
\ No newline at end of file
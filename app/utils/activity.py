@@ -0,0 +1,25 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.activity import TeamActivity
+from app.schemas.activity import ActivityPage
+
+
+async def get_team_activity_page(
+        db: AsyncSession,
+        team_id: int,
+        before: Optional[int],
+        limit: int,
+) -> ActivityPage:
+    # Ключевая пагинация по индексу (team_id, id): глубина ленты не влияет на стоимость страницы
+    query = select(TeamActivity).where(TeamActivity.team_id == team_id)
+    if before is not None:
+        query = query.where(TeamActivity.id < before)
+    result = await db.execute(query.order_by(TeamActivity.id.desc()).limit(limit + 1))
+    rows = result.scalars().all()
+
+    items = rows[:limit]
+    next_cursor = items[-1].id if len(rows) > limit else None
+    return ActivityPage.model_validate({"items": items, "next_cursor": next_cursor}, from_attributes=True)
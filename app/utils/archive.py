@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from sqlalchemy import delete, false, func, insert, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.core import database
+from app.core.config import settings
+from app.core.invalidation import publish_change, commit_changes
+from app.core.jobs import job_runner
+from app.models.archive import ArchivedEvaluation, ArchivedTask, ArchivedTaskComment
+from app.models.evaluation import Evaluation
+from app.models.task import Task, TaskComment, TaskStatus
+from app.models.team import Team, UserTeam
+from app.models.user import User
+from app.utils.bulk import any_id
+
+
+def _copy_rows(target, source, criteria):
+    columns = [column for column in source.__table__.columns if column.name in target.__table__.columns]
+    return insert(target).from_select([column.name for column in columns], select(*columns).where(criteria))
+
+
+async def archive_completed_tasks(db: AsyncSession, older_than: datetime, batch_size: int) -> int:
+    archived = 0
+    while True:
+        # SKIP LOCKED: задачи, которые сейчас кто-то меняет, уйдут в архив при следующем запуске
+        result = await db.execute(
+            select(Task.id)
+            .where(Task.status == TaskStatus.COMPLETED, Task.updated_at < older_than)
+            .order_by(Task.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            await db.commit()
+            return archived
+
+        await db.execute(_copy_rows(ArchivedTask, Task, any_id(Task.id, ids)))
+        await db.execute(_copy_rows(ArchivedTaskComment, TaskComment, any_id(TaskComment.task_id, ids)))
+        await db.execute(_copy_rows(ArchivedEvaluation, Evaluation, any_id(Evaluation.task_id, ids)))
+        # Комментарии и оценки в рабочих таблицах удаляются каскадом
+        result = await db.execute(
+            delete(Task)
+            .where(any_id(Task.id, ids))
+            .returning(Task.team_id, Task.assignee_id)
+            .execution_options(synchronize_session=False)
+        )
+        tags = set()
+        for team_id, assignee_id in result.all():
+            tags.add(f"team:{team_id}")
+            if assignee_id:
+                tags.add(f"user:{assignee_id}")
+        await publish_change(db, "task_changed", *(f"task:{task_id}" for task_id in ids), *tags)
+        await commit_changes(db)
+
+        archived += len(ids)
+        if len(ids) < batch_size:
+            return archived
+
+
+async def run_task_archival() -> None:
+    older_than = datetime.now(timezone.utc) - timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+    async with database.async_session_maker() as session:
+        archived = await archive_completed_tasks(session, older_than, settings.TASK_ARCHIVE_BATCH_SIZE)
+    if archived:
+        print(f"В архив перенесено завершённых задач: {archived}")
+
+
+def schedule_task_archival() -> bool:
+    return job_runner.submit_periodic("archive-tasks", settings.TASK_ARCHIVE_INTERVAL_SECONDS, run_task_archival)
+
+
+def archived_task_options():
+    return (
+        selectinload(ArchivedTask.creator),
+        selectinload(ArchivedTask.assignee),
+        selectinload(ArchivedTask.team),
+        selectinload(ArchivedTask.comments).selectinload(ArchivedTaskComment.author),
+    )
+
+
+async def get_archived_task(db: AsyncSession, task_id: int):
+    result = await db.execute(
+        select(ArchivedTask).options(*archived_task_options()).where(ArchivedTask.id == task_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_archived_task_comments(db: AsyncSession, task_id: int):
+    result = await db.execute(
+        select(ArchivedTaskComment, User)
+        .outerjoin(User, ArchivedTaskComment.author_id == User.id)
+        .filter(ArchivedTaskComment.task_id == task_id)
+        .order_by(ArchivedTaskComment.created_at)
+    )
+    return result.all()
+
+
+async def get_tasks_page_with_archived(
+        db: AsyncSession,
+        criteria_for,
+        order_by,
+        offset: int,
+        limit: int,
+) -> Tuple[List, int]:
+    # Страница строится по объединению ключей сортировки, строки догружаются из своих таблиц
+    def keys(model, archived: bool):
+        return select(
+            model.id, model.created_at, model.deadline, (true() if archived else false()).label("archived")
+        ).where(*criteria_for(model))
+
+    rows = union_all(keys(Task, False), keys(ArchivedTask, True)).subquery()
+    page = (await db.execute(
+        select(rows.c.id, rows.c.archived)
+        .order_by(*order_by(rows.c))
+        .offset(offset)
+        .limit(limit)
+    )).all()
+    total_count = (await db.execute(select(func.count()).select_from(rows))).scalar()
+
+    hot_ids = [row.id for row in page if not row.archived]
+    archived_ids = [row.id for row in page if row.archived]
+    loaded = {}
+    if hot_ids:
+        result = await db.execute(
+            select(Task).options(
+                selectinload(Task.creator),
+                selectinload(Task.assignee),
+                selectinload(Task.team).selectinload(Team.members).selectinload(UserTeam.user),
+                selectinload(Task.comments).selectinload(TaskComment.author)
+            ).where(Task.id.in_(hot_ids))
+        )
+        loaded.update(((False, task.id), task) for task in result.scalars())
+    if archived_ids:
+        result = await db.execute(
+            select(ArchivedTask).options(*archived_task_options()).where(ArchivedTask.id.in_(archived_ids))
+        )
+        loaded.update(((True, task.id), task) for task in result.scalars())
+
+    tasks = [loaded[(row.archived, row.id)] for row in page if (row.archived, row.id) in loaded]
+    return tasks, total_count
+
+
+EVALUATION_COLUMNS = ("id", "rating", "comment", "task_id", "user_id", "evaluator_id", "created_at")
+
+
+def evaluations_with_archived():
+    return union_all(
+        select(*(getattr(Evaluation, name) for name in EVALUATION_COLUMNS)),
+        select(*(getattr(ArchivedEvaluation, name) for name in EVALUATION_COLUMNS)),
+    ).subquery()
+
+
+async def get_task_title(db: AsyncSession, task_id: int, include_archived: bool = False):
+    title = await db.scalar(select(Task.title).where(Task.id == task_id))
+    if title is None and include_archived:
+        title = await db.scalar(select(ArchivedTask.title).where(ArchivedTask.id == task_id))
+    return title
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import Integer, any_, bindparam, delete, inspect, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+def _chunks(ids: Sequence[int], size: int) -> Iterable[List[int]]:
+    for start in range(0, len(ids), size):
+        yield list(ids[start:start + size])
+
+
+def _versioned(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    # Массовый UPDATE идёт мимо ORM, поэтому версию для оптимистической блокировки увеличиваем сами
+    version = inspect(model).version_id_col
+    if version is None:
+        return values
+    return {**values, version.key: version + 1}
+
+
+def any_id(column, chunk: List[int]):
+    # Один параметр-массив вместо IN (...) с тысячами плейсхолдеров
+    return column == any_(bindparam("ids", chunk, type_=ARRAY(Integer)))
+
+
+async def update_by_ids(
+        db: AsyncSession,
+        model,
+        ids: Sequence[int],
+        values: Dict[str, Any],
+        chunk_size: int = settings.ADMIN_BULK_CHUNK_SIZE,
+) -> int:
+    affected = 0
+    for chunk in _chunks(ids, chunk_size):
+        result = await db.execute(
+            update(model)
+            .where(any_id(model.id, chunk))
+            .values(**_versioned(model, values))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        affected += result.rowcount
+    return affected
+
+
+async def delete_by_ids(
+        db: AsyncSession,
+        model,
+        ids: Sequence[int],
+        chunk_size: int = settings.ADMIN_BULK_CHUNK_SIZE,
+) -> int:
+    affected = 0
+    for chunk in _chunks(ids, chunk_size):
+        result = await db.execute(
+            delete(model)
+            .where(any_id(model.id, chunk))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        affected += result.rowcount
+    return affected
+
+
+async def update_where(
+        db: AsyncSession,
+        model,
+        criteria: Sequence,
+        values: Dict[str, Any],
+        chunk_size: int = settings.ADMIN_BULK_CHUNK_SIZE,
+) -> int:
+    # criteria должны перестать выполняться после обновления, иначе пачки будут повторяться
+    affected = 0
+    while True:
+        chunk = select(model.id).where(*criteria).limit(chunk_size).scalar_subquery()
+        result = await db.execute(
+            update(model)
+            .where(model.id.in_(chunk))
+            .values(**_versioned(model, values))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        affected += result.rowcount
+        if result.rowcount < chunk_size:
+            return affected
+
+
+async def delete_where(
+        db: AsyncSession,
+        model,
+        criteria: Sequence,
+        chunk_size: int = settings.ADMIN_BULK_CHUNK_SIZE,
+) -> int:
+    affected = 0
+    while True:
+        chunk = select(model.id).where(*criteria).limit(chunk_size).scalar_subquery()
+        result = await db.execute(
+            delete(model)
+            .where(model.id.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        affected += result.rowcount
+        if result.rowcount < chunk_size:
+            return affected
@@ -5,6 +5,7 @@ from sqlalchemy import or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.models.archive import ArchivedTask
 from app.models.meeting import Meeting, MeetingParticipant
 from app.models.task import Task, TaskStatus
 
@@ -13,24 +14,27 @@ async def get_user_calendar_events(
         db: AsyncSession,
         user_id: int,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        include_archived: bool = False
 ) -> List[Dict[str, Any]]:
     events = []
 
     try:
-        tasks_query = select(Task).filter(
-            Task.assignee_id == user_id,
-            or_(
-                Task.deadline.between(start_date, end_date),
-                and_(
-                    Task.deadline.is_(None),
-                    Task.created_at.between(start_date, end_date)
+        tasks = []
+        for model in (Task, ArchivedTask) if include_archived else (Task,):
+            tasks_query = select(model).filter(
+                model.assignee_id == user_id,
+                or_(
+                    model.deadline.between(start_date, end_date),
+                    and_(
+                        model.deadline.is_(None),
+                        model.created_at.between(start_date, end_date)
+                    )
                 )
             )
-        )
 
-        tasks_result = await db.execute(tasks_query)
-        tasks = tasks_result.scalars().all()
+            tasks_result = await db.execute(tasks_query)
+            tasks.extend(tasks_result.scalars().all())
 
         for task in tasks:
             event_date = task.deadline or task.created_at
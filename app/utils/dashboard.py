@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.evaluation import Evaluation
+from app.models.meeting import Meeting, MeetingParticipant
+from app.models.task import Task, TaskStatus
+from app.models.team import Team, UserTeam
+from app.schemas.dashboard import DashboardEvaluations, DashboardTasks
+
+
+async def get_dashboard_teams(db: AsyncSession, user_id: int):
+    members_count = (
+        select(func.count(UserTeam.id))
+        .where(UserTeam.team_id == Team.id)
+        .correlate(Team)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(Team.id, Team.name, Team.description, members_count.label("members_count"))
+        .join(UserTeam, UserTeam.team_id == Team.id)
+        .where(UserTeam.user_id == user_id)
+        .order_by(Team.name)
+    )
+    return result.all()
+
+
+async def get_dashboard_tasks(db: AsyncSession, user_id: int, limit: int) -> DashboardTasks:
+    counts = await db.execute(
+        select(Task.status, func.count(Task.id))
+        .where(Task.assignee_id == user_id)
+        .group_by(Task.status)
+    )
+    by_status = {status.value: count for status, count in counts.all() if status is not None}
+
+    result = await db.execute(
+        select(Task.id, Task.title, Task.status, Task.deadline, Task.team_id)
+        .where(Task.assignee_id == user_id, Task.status != TaskStatus.COMPLETED)
+        .order_by(Task.deadline.asc().nulls_last(), Task.id.desc())
+        .limit(limit)
+    )
+    return DashboardTasks(total=sum(by_status.values()), by_status=by_status, open=result.all())
+
+
+async def get_dashboard_meetings(db: AsyncSession, user_id: int, limit: int):
+    result = await db.execute(
+        select(Meeting.id, Meeting.title, Meeting.start_time, Meeting.end_time, Meeting.team_id)
+        .join(MeetingParticipant, Meeting.id == MeetingParticipant.meeting_id)
+        .where(MeetingParticipant.user_id == user_id, Meeting.start_time >= func.now())
+        .order_by(Meeting.start_time)
+        .limit(limit)
+    )
+    return result.all()
+
+
+async def get_dashboard_evaluations(db: AsyncSession, user_id: int, days: int) -> DashboardEvaluations:
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    result = await db.execute(
+        select(
+            func.avg(Evaluation.rating).label("average_rating"),
+            func.count(Evaluation.id).label("total_evaluations")
+        )
+        .where(
+            Evaluation.user_id == user_id,
+            Evaluation.created_at >= start_date,
+            Evaluation.created_at <= end_date
+        )
+    )
+    stats = result.first()
+
+    return DashboardEvaluations(
+        average_rating=float(stats.average_rating) if stats.average_rating else 0.0,
+        total_evaluations=stats.total_evaluations,
+        period_start=start_date,
+        period_end=end_date
+    )
@@ -1,7 +1,11 @@
+from sqlalchemy import func, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 
 from app.models.meeting import Meeting, MeetingParticipant
+from app.models.team import Team, UserTeam
+from app.models.user import User
 
 
 async def get_meeting_by_id(db: AsyncSession, meeting_id: int):
@@ -27,3 +31,48 @@ async def is_meeting_participant(db: AsyncSession, user_id: int, meeting_id: int
         )
     )
     return result.scalar_one_or_none() is not None
+
+
+async def get_meeting_version(db: AsyncSession, meeting_id: int, user_id: int):
+    organizer = aliased(User)
+
+    participants_count = (
+        select(func.count(MeetingParticipant.id))
+        .where(MeetingParticipant.meeting_id == Meeting.id)
+        .scalar_subquery()
+    )
+    participants_changed_at = (
+        select(func.max(MeetingParticipant.created_at))
+        .where(MeetingParticipant.meeting_id == Meeting.id)
+        .scalar_subquery()
+    )
+    participant_users_changed_at = (
+        select(func.max(User.updated_at))
+        .join(MeetingParticipant, MeetingParticipant.user_id == User.id)
+        .where(MeetingParticipant.meeting_id == Meeting.id)
+        .scalar_subquery()
+    )
+    is_participant = exists().where(
+        MeetingParticipant.meeting_id == Meeting.id,
+        MeetingParticipant.user_id == user_id
+    )
+    is_member = exists().where(UserTeam.user_id == user_id, UserTeam.team_id == Meeting.team_id)
+
+    result = await db.execute(
+        select(
+            Meeting.team_id,
+            is_participant.label("is_participant"),
+            is_member.label("is_member"),
+            Meeting.updated_at,
+            Meeting.version,
+            Team.updated_at.label("team_updated_at"),
+            organizer.updated_at.label("organizer_updated_at"),
+            participants_count.label("participants_count"),
+            participants_changed_at.label("participants_changed_at"),
+            participant_users_changed_at.label("participant_users_changed_at"),
+        )
+        .outerjoin(Team, Team.id == Meeting.team_id)
+        .outerjoin(organizer, organizer.id == Meeting.organizer_id)
+        .where(Meeting.id == meeting_id)
+    )
+    return result.first()
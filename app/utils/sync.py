@@ -0,0 +1,174 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core import database
+from app.core.config import settings
+from app.core.jobs import job_runner
+from app.core.replica import READ_LAG_BOUND
+from app.models.meeting import Meeting
+from app.models.sync import SyncTombstone
+from app.models.task import Task, TaskComment
+from app.models.team import UserTeam
+from app.utils.bulk import delete_where
+
+SYNC_ENTITIES = ("tasks", "comments", "meetings", "memberships", "deleted")
+
+SyncCursor = Tuple[datetime, int]
+
+
+class SyncToken:
+    # Позиция клиента: для каждой сущности последняя выданная пара (updated_at, id).
+    # horizon задан, пока страницы одного снимка не выбраны до конца.
+    def __init__(
+            self,
+            cursors: Optional[Dict[str, SyncCursor]] = None,
+            horizon: Optional[datetime] = None,
+            team_id: Optional[int] = None,
+    ):
+        self.cursors = cursors or {}
+        self.horizon = horizon
+        self.team_id = team_id
+
+    def encode(self) -> str:
+        data = {
+            "c": {entity: [ts.isoformat(), row_id] for entity, (ts, row_id) in self.cursors.items()},
+            "h": self.horizon.isoformat() if self.horizon else None,
+            "t": self.team_id,
+        }
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "SyncToken":
+        try:
+            data = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+            cursors = {
+                entity: (datetime.fromisoformat(ts), int(row_id))
+                for entity, (ts, row_id) in data["c"].items()
+                if entity in SYNC_ENTITIES
+            }
+            horizon = datetime.fromisoformat(data["h"]) if data.get("h") else None
+            team_id = int(data["t"]) if data.get("t") is not None else None
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            raise ValueError("Invalid sync token") from e
+        return cls(cursors, horizon, team_id)
+
+
+async def database_now(db: AsyncSession) -> datetime:
+    result = await db.execute(select(func.now()))
+    return result.scalar_one()
+
+
+def sync_horizon(db: AsyncSession, now: datetime) -> datetime:
+    # now() в строке — начало транзакции, а видна она станет только после коммита.
+    # Выдаём изменения не новее горизонта, чтобы медленная транзакция не проскочила мимо курсора;
+    # на реплике горизонт сдвигается ещё и на допустимое отставание
+    return now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS + db.info.get(READ_LAG_BOUND, 0))
+
+
+def sync_token_expired(token: SyncToken, now: datetime) -> bool:
+    # Следы удалений старше срока хранения уже стёрты, дельту по ним не восстановить
+    cursor = token.cursors.get("deleted")
+    if cursor is None:
+        return False
+    return cursor[0] < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def _sync_queries(user_id: int, team_ids: Sequence[int], own_tombstones: bool):
+    deleted_visible = SyncTombstone.team_id.in_(team_ids)
+    if own_tombstones:
+        # Исключение из команды: сама команда уже недоступна, но след членства пользователь должен увидеть
+        deleted_visible = or_(deleted_visible, SyncTombstone.user_id == user_id)
+
+    return {
+        "tasks": (
+            select(Task).where(Task.team_id.in_(team_ids)),
+            Task.updated_at, Task.id,
+        ),
+        "comments": (
+            select(
+                TaskComment.id,
+                TaskComment.content,
+                TaskComment.task_id,
+                TaskComment.author_id,
+                Task.team_id,
+                TaskComment.created_at,
+                TaskComment.updated_at,
+            )
+            .join(Task, Task.id == TaskComment.task_id)
+            .where(Task.team_id.in_(team_ids)),
+            TaskComment.updated_at, TaskComment.id,
+        ),
+        "meetings": (
+            select(Meeting).where(Meeting.team_id.in_(team_ids)),
+            Meeting.updated_at, Meeting.id,
+        ),
+        "memberships": (
+            select(UserTeam).where(UserTeam.team_id.in_(team_ids)),
+            UserTeam.updated_at, UserTeam.id,
+        ),
+        "deleted": (
+            select(SyncTombstone).where(deleted_visible),
+            SyncTombstone.deleted_at, SyncTombstone.id,
+        ),
+    }
+
+
+async def get_sync_changes(
+        db: AsyncSession,
+        user_id: int,
+        team_ids: Sequence[int],
+        token: SyncToken,
+        horizon: datetime,
+        limit: int,
+        own_tombstones: bool = True,
+) -> Tuple[Dict[str, List], SyncToken, bool]:
+    changes = {}
+    cursors = dict(token.cursors)
+    has_more = False
+
+    for entity, (query, changed_at, row_id) in _sync_queries(user_id, team_ids, own_tombstones).items():
+        query = query.where(changed_at <= horizon)
+        cursor = cursors.get(entity)
+        if cursor is not None:
+            query = query.where(tuple_(changed_at, row_id) > tuple_(*cursor))
+        result = await db.execute(query.order_by(changed_at, row_id).limit(limit))
+        rows = result.scalars().all() if entity != "comments" else result.all()
+        changes[entity] = rows
+
+        if rows:
+            last = rows[-1]
+            cursor = (getattr(last, changed_at.key), last.id)
+        if len(rows) == limit:
+            has_more = True
+        elif cursor is None or cursor < (horizon, 0):
+            # Всё до горизонта выдано: следующую дельту начинаем с него
+            cursor = (horizon, 0)
+        cursors[entity] = cursor
+
+    next_token = SyncToken(cursors, horizon if has_more else None, token.team_id)
+    return changes, next_token, has_more
+
+
+async def purge_sync_tombstones(db: AsyncSession, older_than: datetime) -> int:
+    return await delete_where(db, SyncTombstone, [SyncTombstone.deleted_at < older_than])
+
+
+async def run_tombstone_purge() -> None:
+    older_than = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    async with database.async_session_maker() as session:
+        purged = await purge_sync_tombstones(session, older_than)
+    if purged:
+        print(f"Удалено устаревших следов синхронизации: {purged}")
+
+
+def schedule_tombstone_purge() -> bool:
+    return job_runner.submit_periodic(
+        "purge-sync-tombstones", settings.SYNC_TOMBSTONE_PURGE_INTERVAL_SECONDS, run_tombstone_purge
+    )
@@ -1,7 +1,10 @@
+from sqlalchemy import func, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 
 from app.models.task import Task, TaskComment
+from app.models.team import Team, UserTeam
 from app.models.user import User
 
 
@@ -13,8 +16,51 @@ async def get_task_by_id(db: AsyncSession, task_id: int):
 async def get_task_comments(db: AsyncSession, task_id: int):
     result = await db.execute(
         select(TaskComment, User)
-        .join(User, TaskComment.author_id == User.id)
+        .outerjoin(User, TaskComment.author_id == User.id)
         .filter(TaskComment.task_id == task_id)
         .order_by(TaskComment.created_at)
     )
     return result.all()
+
+
+async def get_task_version(db: AsyncSession, task_id: int, user_id: int):
+    creator = aliased(User)
+    assignee = aliased(User)
+
+    comments_count = (
+        select(func.count(TaskComment.id))
+        .where(TaskComment.task_id == Task.id)
+        .scalar_subquery()
+    )
+    comments_changed_at = (
+        select(func.max(TaskComment.created_at))
+        .where(TaskComment.task_id == Task.id)
+        .scalar_subquery()
+    )
+    authors_changed_at = (
+        select(func.max(User.updated_at))
+        .join(TaskComment, TaskComment.author_id == User.id)
+        .where(TaskComment.task_id == Task.id)
+        .scalar_subquery()
+    )
+    is_member = exists().where(UserTeam.user_id == user_id, UserTeam.team_id == Task.team_id)
+
+    result = await db.execute(
+        select(
+            Task.team_id,
+            is_member.label("is_member"),
+            Task.updated_at,
+            Task.version,
+            Team.updated_at.label("team_updated_at"),
+            creator.updated_at.label("creator_updated_at"),
+            assignee.updated_at.label("assignee_updated_at"),
+            comments_count.label("comments_count"),
+            comments_changed_at.label("comments_changed_at"),
+            authors_changed_at.label("authors_changed_at"),
+        )
+        .outerjoin(Team, Team.id == Task.team_id)
+        .outerjoin(creator, creator.id == Task.creator_id)
+        .outerjoin(assignee, assignee.id == Task.assignee_id)
+        .where(Task.id == task_id)
+    )
+    return result.first()
@@ -1,12 +1,24 @@
 import secrets
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import delete, func, exists, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core import database
+from app.core.config import settings
+from app.core.jobs import job_runner
+from app.models.activity import TeamActivity
+from app.models.archive import ArchivedTask
+from app.models.meeting import Meeting
+from app.models.task import Task
 from app.models.team import Team, UserTeam
 from app.models.user import User
 from app.schemas.team import TeamRead, TeamMember
 from app.schemas.user import UserRead
+from app.utils.bulk import delete_where
 
 
 def generate_invite_code():
@@ -14,11 +26,36 @@ def generate_invite_code():
 
 
 async def get_team_by_id(db: AsyncSession, team_id: int):
-    result = await db.execute(select(Team).filter(Team.id == team_id))
+    result = await db.execute(select(Team).filter(Team.id == team_id, Team.deleting.is_(False)))
     return result.scalar_one_or_none()
 
 
+# Роли в пределах одного запроса /batch: вложенные запросы часто проверяют одну и ту же команду
+_team_role_cache: ContextVar[Optional[Dict[Tuple[int, int], Optional[str]]]] = ContextVar(
+    "team_role_cache", default=None
+)
+
+
+@contextmanager
+def team_role_cache():
+    token = _team_role_cache.set({})
+    try:
+        yield
+    finally:
+        _team_role_cache.reset(token)
+
+
+def clear_team_role_cache():
+    cache = _team_role_cache.get()
+    if cache is not None:
+        cache.clear()
+
+
 async def get_user_team_role(db: AsyncSession, user_id: int, team_id: int):
+    cache = _team_role_cache.get()
+    if cache is not None and (user_id, team_id) in cache:
+        return cache[(user_id, team_id)]
+
     result = await db.execute(
         select(UserTeam).filter(
             UserTeam.user_id == user_id,
@@ -26,7 +63,17 @@ async def get_user_team_role(db: AsyncSession, user_id: int, team_id: int):
         )
     )
     user_team = result.scalar_one_or_none()
-    return user_team.role if user_team else None
+    role = user_team.role if user_team else None
+    if cache is not None:
+        cache[(user_id, team_id)] = role
+    return role
+
+
+async def get_user_team_ids(db: AsyncSession, user_id: int):
+    result = await db.execute(
+        select(UserTeam.team_id).filter(UserTeam.user_id == user_id)
+    )
+    return result.scalars().all()
 
 
 async def is_team_admin(db: AsyncSession, user_id: int, team_id: int):
@@ -63,6 +110,40 @@ async def get_common_teams(db: AsyncSession, user1_id: int, user2_id: int):
     return result.scalars().all()
 
 
+async def get_team_version(db: AsyncSession, team_id: int, user_id: int):
+    members_count = (
+        select(func.count(UserTeam.id))
+        .where(UserTeam.team_id == Team.id)
+        .scalar_subquery()
+    )
+    # updated_at, а не created_at: смена роли тоже меняет ответ
+    members_changed_at = (
+        select(func.max(UserTeam.updated_at))
+        .where(UserTeam.team_id == Team.id)
+        .scalar_subquery()
+    )
+    member_users_changed_at = (
+        select(func.max(User.updated_at))
+        .join(UserTeam, UserTeam.user_id == User.id)
+        .where(UserTeam.team_id == Team.id)
+        .scalar_subquery()
+    )
+    is_member = exists().where(UserTeam.user_id == user_id, UserTeam.team_id == Team.id)
+
+    result = await db.execute(
+        select(
+            is_member.label("is_member"),
+            Team.updated_at,
+            Team.version,
+            members_count.label("members_count"),
+            members_changed_at.label("members_changed_at"),
+            member_users_changed_at.label("member_users_changed_at"),
+        )
+        .where(Team.id == team_id, Team.deleting.is_(False))
+    )
+    return result.first()
+
+
 async def convert_team_to_team_read(db: AsyncSession, team: Team) -> TeamRead:
     result = await db.execute(
         select(UserTeam)
@@ -91,5 +172,69 @@ async def convert_team_to_team_read(db: AsyncSession, team: Team) -> TeamRead:
         invite_code=team.invite_code,
         created_at=team.created_at,
         updated_at=team.updated_at,
+        version=team.version,
         members=members
     )
+
+
+async def count_team_rows(db: AsyncSession, team_id: int, limit: int) -> int:
+    # Считаем не дальше limit: для решения "удалять сразу или в фоне" точное число не нужно
+    tasks = select(Task.id).where(Task.team_id == team_id).limit(limit).subquery()
+    meetings = select(Meeting.id).where(Meeting.team_id == team_id).limit(limit).subquery()
+    archived = select(ArchivedTask.id).where(ArchivedTask.team_id == team_id).limit(limit).subquery()
+    activity = select(TeamActivity.id).where(TeamActivity.team_id == team_id).limit(limit).subquery()
+    result = await db.execute(
+        select(
+            select(func.count()).select_from(tasks).scalar_subquery()
+            + select(func.count()).select_from(meetings).scalar_subquery()
+            + select(func.count()).select_from(archived).scalar_subquery()
+            + select(func.count()).select_from(activity).scalar_subquery()
+        )
+    )
+    return result.scalar_one()
+
+
+async def delete_team_rows(db: AsyncSession, team_id: int, chunk_size: int) -> None:
+    # Комментарии, оценки и участники встреч удаляются каскадом в БД вместе со своей пачкой
+    tasks = await delete_where(db, Task, [Task.team_id == team_id], chunk_size)
+    meetings = await delete_where(db, Meeting, [Meeting.team_id == team_id], chunk_size)
+    archived = await delete_where(db, ArchivedTask, [ArchivedTask.team_id == team_id], chunk_size)
+    # У журнала нет внешнего ключа, каскад его не удалит
+    activity = await delete_where(db, TeamActivity, [TeamActivity.team_id == team_id], chunk_size)
+    await db.execute(delete(Team).where(Team.id == team_id))
+    await db.commit()
+    print(f"Команда {team_id} удалена: задач {tasks}, встреч {meetings}, архивных задач {archived}, "
+          f"событий {activity}")
+
+
+async def start_team_deletion(db: AsyncSession, team_id: int) -> Optional[int]:
+    # Метка ставится в одной транзакции с удалением участников: если воркер остановится раньше,
+    # чем фоновое удаление закончится, resume_team_deletions продолжит его при следующем старте
+    marked = await db.execute(
+        update(Team)
+        .where(Team.id == team_id, Team.deleting.is_(False))
+        .values(deleting=True, version=Team.version + 1)
+    )
+    if not marked.rowcount:
+        return None
+    result = await db.execute(delete(UserTeam).where(UserTeam.team_id == team_id))
+    return result.rowcount
+
+
+def schedule_team_deletion(team_id: int) -> bool:
+    async def job():
+        async with database.async_session_maker() as session:
+            await delete_team_rows(session, team_id, settings.TEAM_DELETE_CHUNK_SIZE)
+
+    return job_runner.submit(f"delete-team:{team_id}", job)
+
+
+async def resume_team_deletions() -> List[int]:
+    # При нескольких воркерах удаление одной команды может запуститься в каждом из них:
+    # пачки удаляются по условию, поэтому повторный проход просто ничего не найдёт
+    async with database.async_session_maker() as session:
+        result = await session.execute(select(Team.id).where(Team.deleting.is_(True)))
+        team_ids = result.scalars().all()
+    for team_id in team_ids:
+        schedule_team_deletion(team_id)
+    return team_ids
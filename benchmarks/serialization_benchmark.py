@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.serialization import dump_json
+from app.schemas.task import PaginatedResponse, TaskRead, TaskStatus
+
+PAGE_SIZE = 100
+
+
+def make_user(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        first_name="Иван",
+        last_name="Петров",
+        is_active=True,
+        is_superuser=False,
+        is_verified=True,
+    )
+
+
+def make_task(task_id: int) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    creator = make_user(task_id % 7 + 1)
+    assignee = make_user(task_id % 5 + 10)
+    comments = [
+        SimpleNamespace(
+            id=task_id * 10 + i,
+            content="Комментарий к задаче " * 3,
+            author=make_user(i + 20),
+            created_at=now,
+        )
+        for i in range(3)
+    ]
+    return SimpleNamespace(
+        id=task_id,
+        title=f"Задача {task_id}",
+        description="Описание задачи " * 10,
+        status=TaskStatus.IN_PROGRESS,
+        deadline=now + timedelta(days=3),
+        creator_id=creator.id,
+        assignee_id=assignee.id,
+        team_id=1,
+        created_at=now,
+        updated_at=now,
+        creator=creator,
+        assignee=assignee,
+        team=SimpleNamespace(id=1, name="Команда", description=None),
+        comments=comments,
+    )
+
+
+def make_page(tasks) -> PaginatedResponse[TaskRead]:
+    # Как в _cache_tasks_page: страница собирается из ORM-объектов, их валидация входит в замер
+    return PaginatedResponse[TaskRead](
+        items=tasks,
+        page=1,
+        per_page=PAGE_SIZE,
+        total_count=PAGE_SIZE,
+        total_pages=1,
+    )
+
+
+async def fastapi_default(field, tasks) -> bytes:
+    content = await serialize_response(field=field, response_content=make_page(tasks))
+    return JSONResponse(content).body
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, samples) -> None:
+    print(
+        f"{name:<22} p50={percentile(samples, 50) * 1000:7.3f} ms  "
+        f"p99={percentile(samples, 99) * 1000:7.3f} ms  "
+        f"mean={statistics.mean(samples) * 1000:7.3f} ms"
+    )
+
+
+async def main(iterations: int) -> None:
+    tasks = [make_task(i) for i in range(PAGE_SIZE)]
+    field = create_model_field(name="Response", type_=PaginatedResponse[TaskRead], mode="serialization")
+
+    async def pydantic_fast_path() -> bytes:
+        return dump_json(PaginatedResponse[TaskRead], make_page(tasks), encoder="pydantic")
+
+    async def orjson_fast_path() -> bytes:
+        return dump_json(PaginatedResponse[TaskRead], make_page(tasks), encoder="orjson")
+
+    cases = {
+        "fastapi response_model": lambda: fastapi_default(field, tasks),
+        "pydantic dump_json": pydantic_fast_path,
+        "orjson": orjson_fast_path,
+    }
+
+    for name, case in cases.items():
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await case()
+            samples.append(time.perf_counter() - started)
+        report(name, samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение сериализации страницы из 100 задач")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
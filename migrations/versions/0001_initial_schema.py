@@ -0,0 +1,156 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 10:00:00
+
+Повторяет схему, которую раньше создавал Base.metadata.create_all, с теми же
+именами ограничений. Базу, созданную старым create_all, достаточно пометить
+командой `alembic stamp 0001`.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_status = sa.Enum("OPEN", "IN_PROGRESS", "COMPLETED", name="taskstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "teams",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("invite_code", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="teams_pkey"),
+        sa.UniqueConstraint("invite_code", name="teams_invite_code_key"),
+    )
+    op.create_index("ix_teams_id", "teams", ["id"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("first_name", sa.String(), nullable=True),
+        sa.Column("last_name", sa.String(), nullable=True),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.Column("email", sa.String(length=320), nullable=False),
+        sa.Column("hashed_password", sa.String(length=1024), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_superuser", sa.Boolean(), nullable=False),
+        sa.Column("is_verified", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name="users_pkey"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "meetings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("organizer_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="meetings_pkey"),
+        sa.ForeignKeyConstraint(["organizer_id"], ["users.id"], name="meetings_organizer_id_fkey"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"], name="meetings_team_id_fkey"),
+    )
+    op.create_index("ix_meetings_id", "meetings", ["id"])
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", task_status, nullable=True),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("creator_id", sa.Integer(), nullable=True),
+        sa.Column("assignee_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="tasks_pkey"),
+        sa.ForeignKeyConstraint(["creator_id"], ["users.id"], name="tasks_creator_id_fkey"),
+        sa.ForeignKeyConstraint(["assignee_id"], ["users.id"], name="tasks_assignee_id_fkey"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"], name="tasks_team_id_fkey"),
+    )
+    op.create_index("ix_tasks_id", "tasks", ["id"])
+
+    op.create_table(
+        "user_teams",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="user_teams_pkey"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="user_teams_user_id_fkey"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"], name="user_teams_team_id_fkey"),
+    )
+    op.create_index("ix_user_teams_id", "user_teams", ["id"])
+
+    op.create_table(
+        "evaluations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rating", sa.SmallInteger(), nullable=False),
+        sa.Column("comment", sa.Text(), nullable=True),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("evaluator_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="evaluations_pkey"),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], name="evaluations_task_id_fkey"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="evaluations_user_id_fkey"),
+        sa.ForeignKeyConstraint(["evaluator_id"], ["users.id"], name="evaluations_evaluator_id_fkey"),
+    )
+    op.create_index("ix_evaluations_id", "evaluations", ["id"])
+
+    op.create_table(
+        "meeting_participants",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("meeting_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="meeting_participants_pkey"),
+        sa.ForeignKeyConstraint(["meeting_id"], ["meetings.id"], name="meeting_participants_meeting_id_fkey"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="meeting_participants_user_id_fkey"),
+    )
+    op.create_index("ix_meeting_participants_id", "meeting_participants", ["id"])
+
+    op.create_table(
+        "task_comments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("author_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="task_comments_pkey"),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], name="task_comments_task_id_fkey"),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"], name="task_comments_author_id_fkey"),
+    )
+    op.create_index("ix_task_comments_id", "task_comments", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("task_comments")
+    op.drop_table("meeting_participants")
+    op.drop_table("evaluations")
+    op.drop_table("user_teams")
+    op.drop_table("tasks")
+    op.drop_table("meetings")
+    op.drop_table("users")
+    op.drop_table("teams")
+    task_status.drop(op.get_bind(), checkfirst=True)
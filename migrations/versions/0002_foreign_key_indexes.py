@@ -0,0 +1,45 @@
+"""foreign key indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_tasks_assignee_id", "tasks", ["assignee_id"]),
+    ("ix_tasks_creator_id", "tasks", ["creator_id"]),
+    ("ix_tasks_team_id", "tasks", ["team_id"]),
+    ("ix_task_comments_task_id", "task_comments", ["task_id"]),
+    ("ix_task_comments_author_id", "task_comments", ["author_id"]),
+    ("ix_meetings_team_id", "meetings", ["team_id"]),
+    ("ix_meetings_organizer_id", "meetings", ["organizer_id"]),
+    ("ix_meeting_participants_meeting_id", "meeting_participants", ["meeting_id"]),
+    ("ix_meeting_participants_user_id", "meeting_participants", ["user_id"]),
+    ("ix_user_teams_user_id_team_id", "user_teams", ["user_id", "team_id"]),
+    ("ix_user_teams_team_id", "user_teams", ["team_id"]),
+    ("ix_evaluations_task_id", "evaluations", ["task_id"]),
+    ("ix_evaluations_user_id", "evaluations", ["user_id"]),
+    ("ix_evaluations_evaluator_id", "evaluations", ["evaluator_id"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в рабочие таблицы, но не может выполняться в транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,55 @@
+"""foreign key on delete rules
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, колонка, ссылается на, ON DELETE)
+FOREIGN_KEYS = [
+    ("user_teams", "user_id", "users", "CASCADE"),
+    ("user_teams", "team_id", "teams", "CASCADE"),
+    ("tasks", "creator_id", "users", "SET NULL"),
+    ("tasks", "assignee_id", "users", "SET NULL"),
+    ("tasks", "team_id", "teams", "CASCADE"),
+    ("task_comments", "task_id", "tasks", "CASCADE"),
+    ("task_comments", "author_id", "users", "CASCADE"),
+    ("evaluations", "task_id", "tasks", "CASCADE"),
+    ("evaluations", "user_id", "users", "CASCADE"),
+    ("evaluations", "evaluator_id", "users", "SET NULL"),
+    ("meetings", "organizer_id", "users", "SET NULL"),
+    ("meetings", "team_id", "teams", "CASCADE"),
+    ("meeting_participants", "meeting_id", "meetings", "CASCADE"),
+    ("meeting_participants", "user_id", "users", "CASCADE"),
+]
+
+
+def _replace_foreign_keys(with_rules: bool) -> None:
+    # NOT VALID + VALIDATE: проверка существующих строк не держит блокировку, запрещающую запись
+    for table, column, referenced, on_delete in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        rule = f" ON DELETE {on_delete}" if with_rules else ""
+        op.execute(
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}, "
+            f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {referenced} (id){rule} NOT VALID"
+        )
+    with op.get_context().autocommit_block():
+        for table, column, _, _ in FOREIGN_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(with_rules=True)
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(with_rules=False)
@@ -0,0 +1,96 @@
+"""task archive tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 12:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_status = postgresql.ENUM("OPEN", "IN_PROGRESS", "COMPLETED", name="taskstatus", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", task_status, nullable=True),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("creator_id", sa.Integer(), nullable=True),
+        sa.Column("assignee_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["creator_id"], ["users.id"], name="tasks_archive_creator_id_fkey", ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["assignee_id"], ["users.id"], name="tasks_archive_assignee_id_fkey", ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"], name="tasks_archive_team_id_fkey", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", name="tasks_archive_pkey"),
+    )
+    op.create_index("ix_tasks_archive_creator_id", "tasks_archive", ["creator_id"])
+    op.create_index("ix_tasks_archive_assignee_id", "tasks_archive", ["assignee_id"])
+    op.create_index("ix_tasks_archive_team_id", "tasks_archive", ["team_id"])
+
+    op.create_table(
+        "task_comments_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("author_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks_archive.id"], name="task_comments_archive_task_id_fkey", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"], name="task_comments_archive_author_id_fkey", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", name="task_comments_archive_pkey"),
+    )
+    op.create_index("ix_task_comments_archive_task_id", "task_comments_archive", ["task_id"])
+    op.create_index("ix_task_comments_archive_author_id", "task_comments_archive", ["author_id"])
+
+    op.create_table(
+        "evaluations_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("rating", sa.SmallInteger(), nullable=False),
+        sa.Column("comment", sa.Text(), nullable=True),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("evaluator_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks_archive.id"], name="evaluations_archive_task_id_fkey", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="evaluations_archive_user_id_fkey", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["evaluator_id"], ["users.id"], name="evaluations_archive_evaluator_id_fkey", ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id", name="evaluations_archive_pkey"),
+    )
+    op.create_index("ix_evaluations_archive_task_id", "evaluations_archive", ["task_id"])
+    op.create_index("ix_evaluations_archive_user_id", "evaluations_archive", ["user_id"])
+    op.create_index("ix_evaluations_archive_evaluator_id", "evaluations_archive", ["evaluator_id"])
+
+    # Индекс по рабочей таблице строится без блокировки записи
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_completed_updated_at", "tasks", ["updated_at"],
+            postgresql_where=sa.text("status = 'COMPLETED'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_completed_updated_at", table_name="tasks",
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_table("evaluations_archive")
+    op.drop_table("task_comments_archive")
+    op.drop_table("tasks_archive")
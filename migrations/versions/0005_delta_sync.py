@@ -0,0 +1,91 @@
+"""delta sync: updated_at indexes and tombstones
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 14:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Триггеры уровня оператора: одна вставка на DELETE, сколько бы строк он ни удалил
+TOMBSTONE_TRIGGERS = {
+    "tasks": "SELECT 'task', id, team_id, NULL FROM deleted_rows",
+    "meetings": "SELECT 'meeting', id, team_id, NULL FROM deleted_rows",
+    "user_teams": "SELECT 'membership', id, team_id, user_id FROM deleted_rows",
+    # Комментарии, удалённые каскадом вместе с задачей, покрывает след самой задачи
+    "task_comments": (
+        "SELECT 'comment', deleted_rows.id, tasks.team_id, NULL "
+        "FROM deleted_rows JOIN tasks ON tasks.id = deleted_rows.task_id"
+    ),
+}
+
+UPDATED_AT_INDEXES = (
+    ("ix_tasks_team_id_updated_at", "tasks", ["team_id", "updated_at", "id"]),
+    ("ix_meetings_team_id_updated_at", "meetings", ["team_id", "updated_at", "id"]),
+    ("ix_user_teams_team_id_updated_at", "user_teams", ["team_id", "updated_at", "id"]),
+    ("ix_task_comments_updated_at", "task_comments", ["updated_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_comments",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+    )
+    op.add_column(
+        "user_teams",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+    )
+
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("entity", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id", name="sync_tombstones_pkey"),
+    )
+    op.create_index("ix_sync_tombstones_deleted_at", "sync_tombstones", ["deleted_at", "id"])
+
+    for table, rows in TOMBSTONE_TRIGGERS.items():
+        op.execute(
+            f"CREATE FUNCTION {table}_sync_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$\n"
+            f"BEGIN\n"
+            f"    INSERT INTO sync_tombstones (entity, entity_id, team_id, user_id) {rows};\n"
+            f"    RETURN NULL;\n"
+            f"END\n"
+            f"$$"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_tombstones AFTER DELETE ON {table} "
+            f"REFERENCING OLD TABLE AS deleted_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {table}_sync_tombstones()"
+        )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in UPDATED_AT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in UPDATED_AT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table in TOMBSTONE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_tombstones ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_sync_tombstones()")
+
+    op.drop_table("sync_tombstones")
+    op.drop_column("user_teams", "updated_at")
+    op.drop_column("task_comments", "updated_at")
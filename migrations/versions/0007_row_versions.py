@@ -0,0 +1,29 @@
+"""row versions for optimistic concurrency
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("tasks", "meetings", "teams")
+
+
+def upgrade() -> None:
+    # Константное значение по умолчанию: PostgreSQL добавляет столбец без перезаписи таблицы
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.drop_column(table, "version")
@@ -0,0 +1,45 @@
+"""keep comments and evaluations when a user is deleted
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, колонка); 0003 и 0004 ставили здесь CASCADE, и удаление пользователя стирало его комментарии
+# и полученные оценки вместе с архивными
+FOREIGN_KEYS = [
+    ("task_comments", "author_id"),
+    ("evaluations", "user_id"),
+    ("task_comments_archive", "author_id"),
+    ("evaluations_archive", "user_id"),
+]
+
+
+def _replace_foreign_keys(on_delete: str) -> None:
+    # NOT VALID + VALIDATE: проверка существующих строк не держит блокировку, запрещающую запись
+    for table, column in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.execute(
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}, "
+            f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES users (id) ON DELETE {on_delete} NOT VALID"
+        )
+    with op.get_context().autocommit_block():
+        for table, column in FOREIGN_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+
+def upgrade() -> None:
+    _replace_foreign_keys("SET NULL")
+
+
+def downgrade() -> None:
+    _replace_foreign_keys("CASCADE")
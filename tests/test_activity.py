@@ -0,0 +1,64 @@
+import asyncio
+
+from sqlalchemy.exc import DataError, OperationalError
+
+from app.core.activity import ActivityWriter
+
+
+def make_writer(monkeypatch, fail):
+    writer = ActivityWriter(batch_size=10, flush_interval=1, max_buffer=100, max_retries=2)
+    written = []
+
+    async def insert(rows):
+        error = fail(rows)
+        if error is not None:
+            raise error
+        written.extend(rows)
+
+    monkeypatch.setattr(writer, "_insert", insert)
+    return writer, written
+
+
+def test_poison_event_is_dropped_after_retries(monkeypatch):
+    def fail(rows):
+        if any(row["action"] == "bad" for row in rows):
+            return DataError("INSERT", {}, Exception("invalid input"))
+        return None
+
+    writer, written = make_writer(monkeypatch, fail)
+    for action in ("first", "bad", "last"):
+        writer.record(1, 1, action)
+
+    async def scenario():
+        for _ in range(2):
+            await writer.flush()
+            assert len(writer._buffer) == 3
+            assert written == []
+        await writer.flush()
+
+    asyncio.run(scenario())
+    assert [row["action"] for row in written] == ["first", "last"]
+    assert writer._buffer == []
+
+    writer.record(1, 1, "next")
+    asyncio.run(writer.flush())
+    assert [row["action"] for row in written] == ["first", "last", "next"]
+
+
+def test_connection_errors_keep_the_batch(monkeypatch):
+    down = [True]
+
+    def fail(rows):
+        return OperationalError("INSERT", {}, Exception("connection refused")) if down[0] else None
+
+    writer, written = make_writer(monkeypatch, fail)
+    for index in range(15):
+        writer.record(1, 1, f"event-{index}")
+
+    for _ in range(5):
+        asyncio.run(writer.flush())
+    assert len(writer._buffer) == 15
+
+    down[0] = False
+    asyncio.run(writer.flush())
+    assert len(written) == 15
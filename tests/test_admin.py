@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.core.config import settings
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main.app.router, "on_startup", [])
+    monkeypatch.setattr(main.app.router, "on_shutdown", [])
+    monkeypatch.setattr(settings, "ADMIN_USERNAME", "root")
+    monkeypatch.setattr(settings, "ADMIN_PASSWORD", "s3cret-admin")
+    return TestClient(main.app)
+
+
+def login(client, username, password):
+    return client.post(
+        "/admin/login", data={"username": username, "password": password}, follow_redirects=False
+    )
+
+
+def assert_redirects_to_login(response):
+    assert response.status_code in (302, 303)
+    assert "/admin/login" in response.headers["location"]
+
+
+def test_admin_requires_login(client):
+    for path in ("/admin/", "/admin/bulk"):
+        assert_redirects_to_login(client.get(path, follow_redirects=False))
+
+
+def test_admin_login_uses_configured_credentials(client):
+    assert login(client, "admin", "1234").status_code == 400
+    assert login(client, "root", "wrong").status_code == 400
+
+    assert login(client, "root", "s3cret-admin").status_code in (302, 303)
+    assert client.get("/admin/bulk", follow_redirects=False).status_code == 200
+
+
+def test_admin_session_is_invalidated_by_password_change(client, monkeypatch):
+    login(client, "root", "s3cret-admin")
+    monkeypatch.setattr(settings, "ADMIN_PASSWORD", "rotated-password")
+    assert_redirects_to_login(client.get("/admin/bulk", follow_redirects=False))
+
+
+def test_admin_login_is_disabled_with_default_password(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_PASSWORD", "adminpassword")
+    assert login(client, "root", "adminpassword").status_code == 400
@@ -0,0 +1,74 @@
+import asyncio
+
+from app.core.admission import LoadShedder, LoadSheddingMiddleware
+
+
+def _scope(path: str) -> dict:
+    return {"type": "http", "method": "GET", "path": path, "headers": []}
+
+
+def test_open_stream_does_not_cause_shedding():
+    async def scenario():
+        stream_open = asyncio.Event()
+        close_stream = asyncio.Event()
+
+        async def app(scope, receive, send):
+            if scope["path"].startswith("/events"):
+                stream_open.set()
+                await close_stream.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = LoadSheddingMiddleware(app, LoadShedder(["/tasks/list"], max_in_flight=1))
+
+        async def noop(message):
+            pass
+
+        streams = [asyncio.create_task(middleware(_scope("/events/stream"), None, noop)) for _ in range(3)]
+        await stream_open.wait()
+
+        statuses = []
+
+        async def record(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        await middleware(_scope("/tasks/list"), None, record)
+        close_stream.set()
+        await asyncio.gather(*streams)
+        return statuses, middleware.shedder.in_flight
+
+    statuses, in_flight = asyncio.run(scenario())
+    assert statuses == [200]
+    assert in_flight == 0
+
+
+def test_low_priority_requests_are_shed_over_the_limit():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = LoadSheddingMiddleware(app, LoadShedder(["/tasks/list"], max_in_flight=1))
+        statuses = []
+
+        async def record(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        first = asyncio.create_task(middleware(_scope("/tasks/list"), None, record))
+        await asyncio.sleep(0)
+        await middleware(_scope("/tasks/list"), None, record)
+        release.set()
+        await first
+        return statuses
+
+    assert asyncio.run(scenario()) == [503, 200]
+
+
+def test_dashboard_summary_is_low_priority():
+    shedder = LoadShedder()
+    assert shedder.low_priority_prefix(_scope("/dashboard/summary")) == "/dashboard/summary"
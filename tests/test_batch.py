@@ -0,0 +1,45 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core import batch
+from app.core.admission import load_shedder
+from app.core.config import settings
+from app.schemas.batch import BatchRequestItem
+
+
+def make_scope(seen_in_flight):
+    async def router(scope, receive, send):
+        seen_in_flight.append(load_shedder.in_flight)
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b"[]"})
+
+    return {
+        "type": "http",
+        "scheme": "http",
+        "headers": [],
+        "app": SimpleNamespace(router=router),
+        "starlette.exception_handlers": ({}, {}),
+    }
+
+
+def test_low_priority_subrequests_go_through_the_load_shedder(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(settings, "LOAD_SHED_ENABLED", True)
+    monkeypatch.setattr(load_shedder, "low_priority_prefixes", ("/tasks/list",))
+    monkeypatch.setattr(load_shedder, "max_in_flight", 1)
+    seen_in_flight = []
+    scope = make_scope(seen_in_flight)
+
+    listed = asyncio.run(batch.dispatch(scope, BatchRequestItem(method="GET", path="/tasks/list")))
+    assert listed.status == 200
+    assert seen_in_flight == [1]
+    assert load_shedder.in_flight == 0
+
+    monkeypatch.setattr(load_shedder, "in_flight", 1)
+    shed = asyncio.run(batch.dispatch(scope, BatchRequestItem(method="GET", path="/tasks/list")))
+    assert shed.status == 503
+    assert shed.headers["retry-after"] == str(load_shedder.retry_after)
+
+    # Запросы вне списка не отбрасываются и не занимают счётчик
+    other = asyncio.run(batch.dispatch(scope, BatchRequestItem(method="GET", path="/teams/1")))
+    assert other.status == 200
@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, SET_IF_VALID_SCRIPT
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commands = []
+
+    async def execute(self, *args):
+        self.commands.append(args)
+        if args[0] == "SCAN":
+            return b"0", []
+        return 1
+
+
+def test_memory_clear_rejects_in_flight_fill():
+    async def scenario():
+        backend = MemoryCacheBackend(max_entries=10)
+        started_at = time.time()
+        await backend.clear()
+        await backend.set("key", b"stale", ["team:1"], 60, started_at)
+        return await backend.get("key")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_redis_set_checks_stamps_and_writes_in_one_script():
+    async def scenario():
+        backend = RedisCacheBackend("redis://localhost", namespace="t")
+        backend.connection = FakeConnection()
+        await backend.set("key", b"value", ["team:1"], 60, 12.5)
+        await backend.clear()
+        return backend.connection.commands
+
+    set_command, stamp_command, scan_command = asyncio.run(scenario())
+    assert set_command[:3] == ("EVAL", SET_IF_VALID_SCRIPT, 4)
+    assert set_command[3:7] == ("t:cache:key", "t:cleared", "t:invalidated:team:1", "t:tag:team:1")
+    assert set_command[7:] == (b"value", 60, "12.5")
+    # Очистка сначала сдвигает отметку, которую проверяет запись, и только потом удаляет ключи
+    assert stamp_command[:2] == ("SET", "t:cleared")
+    assert scan_command[0] == "SCAN"
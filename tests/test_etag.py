@@ -0,0 +1,95 @@
+from collections import namedtuple
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.core.auth import current_active_user
+from app.core.database import get_async_session
+from app.core.replica import get_read_session
+from app.routers import teams
+
+VersionRow = namedtuple("VersionRow", "is_member updated_at version members_count members_changed_at member_users_changed_at")
+
+CREATED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, team):
+        self.team = team
+
+    def scalar_one_or_none(self):
+        return self.team
+
+
+class FakeSession:
+    def __init__(self, team):
+        self.team = team
+        self.info = {}
+
+    async def execute(self, *args, **kwargs):
+        return FakeResult(self.team)
+
+    async def commit(self):
+        self.team.version += 1
+
+    async def refresh(self, obj):
+        pass
+
+
+def make_client(monkeypatch):
+    team = SimpleNamespace(
+        id=1, name="Team", description=None, invite_code="code",
+        created_at=CREATED_AT, updated_at=CREATED_AT, version=1, members=[],
+    )
+    session = FakeSession(team)
+
+    async def get_team_version(db, team_id, user_id):
+        return VersionRow(True, CREATED_AT, team.version, 1, CREATED_AT, CREATED_AT)
+
+    async def allow(*args, **kwargs):
+        return True
+
+    async def get_team_by_id(db, team_id):
+        return team
+
+    async def noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(teams, "get_team_version", get_team_version)
+    monkeypatch.setattr(teams, "is_team_admin", allow)
+    monkeypatch.setattr(teams, "get_team_by_id", get_team_by_id)
+    monkeypatch.setattr(teams, "publish_change", noop)
+
+    async def get_session():
+        yield session
+
+    app = main.app
+    monkeypatch.setattr(app.router, "on_startup", [])
+    monkeypatch.setattr(app.router, "on_shutdown", [])
+    monkeypatch.setitem(app.dependency_overrides, current_active_user, lambda: SimpleNamespace(id=7))
+    monkeypatch.setitem(app.dependency_overrides, get_async_session, get_session)
+    monkeypatch.setitem(app.dependency_overrides, get_read_session, get_session)
+    return TestClient(app)
+
+
+def test_resource_version_round_trips_into_put_if_match(monkeypatch):
+    client = make_client(monkeypatch)
+
+    fetched = client.get("/teams/1")
+    etag = fetched.headers["etag"]
+    version = fetched.headers["x-resource-version"]
+
+    # Слабый ETag годится только для If-None-Match, If-Match сравнивается строго
+    assert client.put("/teams/1", json={"name": "Renamed"}, headers={"If-Match": etag}).status_code == 412
+
+    updated = client.put("/teams/1", json={"name": "Renamed"}, headers={"If-Match": f'"{version}"'})
+    assert updated.status_code == 200
+    new_version = updated.headers["x-resource-version"]
+    assert new_version != version
+    assert client.get("/teams/1", headers={"If-None-Match": updated.headers["etag"]}).status_code == 304
+
+    stale = client.put("/teams/1", json={"name": "Again"}, headers={"If-Match": f'"{version}"'})
+    assert stale.status_code == 412
+    assert client.put("/teams/1", json={"name": "Again"}, headers={"If-Match": f'"{new_version}"'}).status_code == 200
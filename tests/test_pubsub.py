@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from app.core.invalidation import FLUSH_EVENT, publish_change
+from app.core.notifications import NOTIFY_PAYLOAD_LIMIT
+from app.core.pubsub import event_broker, publish_event
+
+
+class FakeSession:
+    def __init__(self):
+        self.payloads = []
+        self.info = {}
+        self.committed = False
+
+    async def execute(self, statement):
+        channel, payload = statement.compile().params.values()
+        self.payloads.append(payload)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+def test_large_event_is_sent_to_other_workers_as_ids():
+    db = FakeSession()
+    subscription = event_broker.subscribe(["team:1"])
+    try:
+        asyncio.run(publish_event(db, "task.updated", ["team:1"], task_id=5, team_id=1, title="x" * 10000))
+        local = subscription.queue.get_nowait()
+    finally:
+        event_broker.unsubscribe(subscription)
+
+    assert local["title"] == "x" * 10000
+    (payload,) = db.payloads
+    assert len(payload.encode()) <= NOTIFY_PAYLOAD_LIMIT
+    assert json.loads(payload)["event"] == {"type": "task.updated", "partial": True, "task_id": 5, "team_id": 1}
+
+
+def test_small_event_is_sent_unchanged():
+    db = FakeSession()
+    asyncio.run(publish_event(db, "task.updated", ["team:1"], task_id=5, title="Короткая"))
+    (payload,) = db.payloads
+    assert json.loads(payload)["event"] == {"type": "task.updated", "task_id": 5, "title": "Короткая"}
+
+
+def test_too_many_invalidation_tags_fall_back_to_flush():
+    db = FakeSession()
+    asyncio.run(publish_change(db, "task_changed", *[f"task:{i}" for i in range(2000)]))
+    (payload,) = db.payloads
+    assert json.loads(payload)["event"] == FLUSH_EVENT
+
+
+def test_change_is_notified_inside_the_callers_transaction(monkeypatch):
+    from app.core import invalidation
+
+    dispatched = []
+
+    async def record(event, tags):
+        dispatched.append((db.committed, event, tags))
+
+    monkeypatch.setattr(invalidation, "_handlers", [record])
+    db = FakeSession()
+
+    async def scenario():
+        await invalidation.publish_change(db, "task_changed", "task:1")
+        assert db.payloads and not db.committed
+        assert dispatched == []
+        await invalidation.commit_changes(db)
+
+    asyncio.run(scenario())
+    # Свой кеш сбрасывается только после коммита
+    assert dispatched == [(True, "task_changed", ("task:1",))]
@@ -0,0 +1,10 @@
+import pytest
+
+from app.core import serialization
+from app.schemas.team import TeamMember
+
+
+def test_orjson_encoder_fails_loudly_without_the_package(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    with pytest.raises(RuntimeError):
+        serialization.dump_json(TeamMember, {"user": {"id": 1, "email": "a@example.com"}, "role": "member"}, encoder="orjson")